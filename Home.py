@@ -10,20 +10,16 @@ Versi: 1.0.0
 """
 
 import streamlit as st
-import pandas as pd
 from pathlib import Path
+import functools
 import sys
 
 # Add src to path for imports
 sys.path.insert(0, str(Path(__file__).parent))
 
-from src.io import find_data_directory, load_all_commodities, get_data_info
-from src.preprocess import process_all_commodities, validate_data, get_data_quality_stats
+from src.data_loader import Filters, load_and_process_data
 from src.constants import (
     LABELS,
-    COL_DATE,
-    COL_COMMODITY,
-    COL_REGION,
     DEFAULT_DATE_RANGE_DAYS,
     MAX_REGIONS_SELECT,
 )
@@ -47,10 +43,9 @@ st.set_page_config(
 if 'theme_mode' not in st.session_state:
     st.session_state.theme_mode = 'light'
 
-# Function to get theme-specific CSS - RESPONSIVE VERSION
-def get_theme_css(is_dark: bool):
-    # Common styles for both themes
-    common_css = """
+# Shared stylesheet - colors come from CSS custom properties so both themes
+# use the same rules and only the variable block differs per theme
+_BASE_CSS = """
         .main .block-container {
             padding-top: 2rem;
             padding-bottom: 2rem;
@@ -84,8 +79,8 @@ def get_theme_css(is_dark: bool):
         }
         
         .analyst-badge-inactive {
-            background: #e0e0e0;
-            color: #666;
+            background: var(--badge-bg);
+            color: var(--badge-fg);
         }
         
         /* Theme toggle button styling */
@@ -105,392 +100,281 @@ def get_theme_css(is_dark: bool):
             transition: all 0.2s ease;
             text-align: center;
         }
-    """
-    
-    if is_dark:
-        theme_css = """
-            /* ============ DARK MODE ============ */
-            .stApp {
-                background-color: #0E1117 !important;
-            }
-            
-            /* All text - high contrast for dark mode */
-            .stApp, .stApp p, .stApp span, .stApp label, .stApp div,
-            .stMarkdown, .stMarkdown p, .stText {
-                color: #FAFAFA !important;
-            }
-            
-            h1, h2, h3, h4, h5, h6 {
-                color: #FFFFFF !important;
-            }
-            
-            .main-header {
-                font-size: 2.2rem;
-                font-weight: 700;
-                color: #4DA6FF !important;
-                margin-bottom: 0.5rem;
-                letter-spacing: -0.5px;
-            }
-            
-            .sub-header {
-                font-size: 1rem;
-                color: #B0B0B0 !important;
-                margin-bottom: 2rem;
-                font-weight: 400;
-            }
-            
-            /* Sidebar - Dark */
-            section[data-testid="stSidebar"] {
-                background-color: #1A1A2E !important;
-                border-right: 1px solid #333 !important;
-            }
-            
-            section[data-testid="stSidebar"] * {
-                color: #FAFAFA !important;
-            }
-            
-            section[data-testid="stSidebar"] .stSelectbox label,
-            section[data-testid="stSidebar"] .stMultiSelect label {
-                color: #B0B0B0 !important;
-            }
-            
-            .sidebar-header {
-                font-size: 0.85rem;
-                font-weight: 600;
-                color: #4DA6FF !important;
-                text-transform: uppercase;
-                letter-spacing: 0.5px;
-                margin-top: 1.5rem;
-                margin-bottom: 0.8rem;
-            }
-            
-            /* Cards - Dark */
-            .nav-card {
-                text-align: center;
-                padding: 1.2rem;
-                border-radius: 10px;
-                border: 1px solid #333 !important;
-                background: #1E1E2E !important;
-                transition: transform 0.2s, box-shadow 0.2s;
-            }
-            
-            .nav-card:hover {
-                transform: translateY(-2px);
-                box-shadow: 0 4px 12px rgba(0,0,0,0.3);
-            }
-            
-            .nav-card h3 {
-                color: #FFFFFF !important;
-                font-size: 1.1rem;
-                margin-bottom: 0.3rem;
-            }
-            
-            .nav-card p {
-                color: #A0A0A0 !important;
-                font-size: 0.85rem;
-            }
-            
-            /* Info boxes - Dark */
-            .info-box {
-                background-color: rgba(33, 150, 243, 0.15) !important;
-                padding: 1rem;
-                border-radius: 8px;
-                border-left: 4px solid #2196f3;
-                margin: 1rem 0;
-            }
-            
-            .info-box, .info-box * {
-                color: #E3F2FD !important;
-            }
-            
-            .success-box {
-                background-color: rgba(76, 175, 80, 0.15) !important;
-                padding: 1rem;
-                border-radius: 8px;
-                border-left: 4px solid #4caf50;
-                margin: 1rem 0;
-            }
-            
-            .success-box, .success-box * {
-                color: #E8F5E9 !important;
-            }
-            
-            .warning-box {
-                background-color: rgba(255, 152, 0, 0.15) !important;
-                padding: 1rem;
-                border-radius: 8px;
-                border-left: 4px solid #ff9800;
-                margin: 1rem 0;
-            }
-            
-            .warning-box, .warning-box * {
-                color: #FFF3E0 !important;
-            }
-            
-            /* Metric cards - Dark */
-            div[data-testid="metric-container"] {
-                background-color: #1E1E2E !important;
-                padding: 1.2rem;
-                border-radius: 10px;
-                border: 1px solid #333 !important;
-            }
-            
-            div[data-testid="metric-container"] label {
-                color: #B0B0B0 !important;
-            }
-            
-            div[data-testid="metric-container"] div[data-testid="stMetricValue"] {
-                color: #FFFFFF !important;
-            }
-            
-            /* Buttons - Dark */
-            .stButton > button {
-                background: linear-gradient(135deg, #4DA6FF 0%, #3D8BD9 100%) !important;
-                color: #FFFFFF !important;
-                border-radius: 8px !important;
-                font-weight: 600 !important;
-                border: none !important;
-                transition: all 0.2s ease !important;
-            }
-            
-            .stButton > button:hover {
-                transform: translateY(-1px);
-                box-shadow: 0 4px 12px rgba(77, 166, 255, 0.4) !important;
-            }
-            
-            /* Inputs - Dark */
-            .stSelectbox > div > div,
-            .stMultiSelect > div > div,
-            .stTextInput > div > div > input,
-            .stDateInput > div > div > input {
-                background-color: #2D2D3D !important;
-                color: #FAFAFA !important;
-                border-color: #444 !important;
-            }
-            
-            /* DataFrames - Dark */
-            .stDataFrame, .stDataFrame * {
-                background-color: #1E1E2E !important;
-                color: #FAFAFA !important;
-            }
-            
-            /* Expander - Dark */
-            .streamlit-expanderHeader {
-                background-color: #1E1E2E !important;
-                color: #FAFAFA !important;
-                border-radius: 8px;
-            }
-            
-            /* Toggle - Dark mode specific styling */
-            .stToggle > label > span[data-testid="stToggleSwitch"] {
-                background-color: #333 !important;
-            }
-            
-            .stToggle > label > span[data-testid="stToggleSwitch"][aria-checked="true"] {
-                background-color: #4DA6FF !important;
-            }
-            
-            /* Theme indicator */
-            .theme-indicator {
-                background: linear-gradient(135deg, #1a1a2e 0%, #16213e 100%);
-                color: #4DA6FF;
-                padding: 0.5rem 1rem;
-                border-radius: 8px;
-                text-align: center;
-                font-weight: 600;
-                border: 1px solid #333;
-            }
-            
-            /* Analyst badge - Dark */
-            .analyst-badge-inactive {
-                background: #2D2D3D;
-                color: #888;
-            }
-        """
-    else:
-        theme_css = """
-            /* ============ LIGHT MODE ============ */
-            .stApp {
-                background-color: #FFFFFF !important;
-            }
-            
-            /* All text - dark for light mode */
-            .stApp, .stApp p, .stApp span, .stApp label, .stApp div,
-            .stMarkdown, .stMarkdown p, .stText {
-                color: #1A1A1A !important;
-            }
-            
-            h1, h2, h3, h4, h5, h6 {
-                color: #1E3A5F !important;
-            }
-            
-            .main-header {
-                font-size: 2.2rem;
-                font-weight: 700;
-                color: #1E3A5F !important;
-                margin-bottom: 0.5rem;
-                letter-spacing: -0.5px;
-            }
-            
-            .sub-header {
-                font-size: 1rem;
-                color: #5A5A5A !important;
-                margin-bottom: 2rem;
-                font-weight: 400;
-            }
-            
-            /* Sidebar - Light */
-            section[data-testid="stSidebar"] {
-                background-color: #F8F9FA !important;
-                border-right: 1px solid #E0E0E0 !important;
-            }
-            
-            section[data-testid="stSidebar"] * {
-                color: #1A1A1A !important;
-            }
-            
-            section[data-testid="stSidebar"] .stSelectbox label,
-            section[data-testid="stSidebar"] .stMultiSelect label {
-                color: #5A5A5A !important;
-            }
-            
-            .sidebar-header {
-                font-size: 0.85rem;
-                font-weight: 600;
-                color: #1E3A5F !important;
-                text-transform: uppercase;
-                letter-spacing: 0.5px;
-                margin-top: 1.5rem;
-                margin-bottom: 0.8rem;
-            }
-            
-            /* Cards - Light */
-            .nav-card {
-                text-align: center;
-                padding: 1.2rem;
-                border-radius: 10px;
-                border: 1px solid #E0E0E0 !important;
-                background: #FFFFFF !important;
-                transition: transform 0.2s, box-shadow 0.2s;
-            }
-            
-            .nav-card:hover {
-                transform: translateY(-2px);
-                box-shadow: 0 4px 12px rgba(0,0,0,0.1);
-            }
-            
-            .nav-card h3 {
-                color: #1E3A5F !important;
-                font-size: 1.1rem;
-                margin-bottom: 0.3rem;
-            }
-            
-            .nav-card p {
-                color: #666666 !important;
-                font-size: 0.85rem;
-            }
-            
-            /* Info boxes - Light */
-            .info-box {
-                background-color: #E3F2FD !important;
-                padding: 1rem;
-                border-radius: 8px;
-                border-left: 4px solid #2196f3;
-                margin: 1rem 0;
-            }
-            
-            .info-box, .info-box * {
-                color: #0D47A1 !important;
-            }
-            
-            .success-box {
-                background-color: #E8F5E9 !important;
-                padding: 1rem;
-                border-radius: 8px;
-                border-left: 4px solid #4caf50;
-                margin: 1rem 0;
-            }
-            
-            .success-box, .success-box * {
-                color: #1B5E20 !important;
-            }
-            
-            .warning-box {
-                background-color: #FFF3E0 !important;
-                padding: 1rem;
-                border-radius: 8px;
-                border-left: 4px solid #ff9800;
-                margin: 1rem 0;
-            }
-            
-            .warning-box, .warning-box * {
-                color: #E65100 !important;
-            }
-            
-            /* Metric cards - Light */
-            div[data-testid="metric-container"] {
-                background-color: #FFFFFF !important;
-                padding: 1.2rem;
-                border-radius: 10px;
-                border: 1px solid #E0E0E0 !important;
-                box-shadow: 0 1px 3px rgba(0, 0, 0, 0.08);
-            }
-            
-            div[data-testid="metric-container"] label {
-                color: #5A5A5A !important;
-            }
-            
-            div[data-testid="metric-container"] div[data-testid="stMetricValue"] {
-                color: #1A1A1A !important;
-            }
-            
-            /* Buttons - Light */
-            .stButton > button {
-                background: linear-gradient(135deg, #1E3A5F 0%, #2D5A8C 100%) !important;
-                color: #FFFFFF !important;
-                border-radius: 8px !important;
-                font-weight: 600 !important;
-                border: none !important;
-                transition: all 0.2s ease !important;
-            }
-            
-            .stButton > button:hover {
-                transform: translateY(-1px);
-                box-shadow: 0 4px 12px rgba(30, 58, 95, 0.3) !important;
-            }
-            
-            /* Inputs - Light */
-            .stSelectbox > div > div,
-            .stMultiSelect > div > div,
-            .stTextInput > div > div > input,
-            .stDateInput > div > div > input {
-                background-color: #FFFFFF !important;
-                color: #1A1A1A !important;
-                border-color: #E0E0E0 !important;
-            }
-            
-            /* Toggle - Light mode specific styling */
-            .stToggle > label > span[data-testid="stToggleSwitch"] {
-                background-color: #E0E0E0 !important;
-            }
-            
-            .stToggle > label > span[data-testid="stToggleSwitch"][aria-checked="true"] {
-                background-color: #1E3A5F !important;
-            }
-            
-            /* Theme indicator */
-            .theme-indicator {
-                background: linear-gradient(135deg, #f8f9fa 0%, #e9ecef 100%);
-                color: #1E3A5F;
-                padding: 0.5rem 1rem;
-                border-radius: 8px;
-                text-align: center;
-                font-weight: 600;
-                border: 1px solid #E0E0E0;
-            }
-        """
-    
-    return f"<style>{common_css}{theme_css}</style>"
+        
+        .stApp {
+            background-color: var(--bg) !important;
+        }
+        
+        /* All text */
+        .stApp, .stApp p, .stApp span, .stApp label, .stApp div,
+        .stMarkdown, .stMarkdown p, .stText {
+            color: var(--fg) !important;
+        }
+        
+        h1, h2, h3, h4, h5, h6 {
+            color: var(--heading) !important;
+        }
+        
+        .main-header {
+            font-size: 2.2rem;
+            font-weight: 700;
+            color: var(--accent) !important;
+            margin-bottom: 0.5rem;
+            letter-spacing: -0.5px;
+        }
+        
+        .sub-header {
+            font-size: 1rem;
+            color: var(--muted) !important;
+            margin-bottom: 2rem;
+            font-weight: 400;
+        }
+        
+        /* Sidebar */
+        section[data-testid="stSidebar"] {
+            background-color: var(--sidebar-bg) !important;
+            border-right: 1px solid var(--border) !important;
+        }
+        
+        section[data-testid="stSidebar"] * {
+            color: var(--fg) !important;
+        }
+        
+        section[data-testid="stSidebar"] .stSelectbox label,
+        section[data-testid="stSidebar"] .stMultiSelect label {
+            color: var(--muted) !important;
+        }
+        
+        .sidebar-header {
+            font-size: 0.85rem;
+            font-weight: 600;
+            color: var(--accent) !important;
+            text-transform: uppercase;
+            letter-spacing: 0.5px;
+            margin-top: 1.5rem;
+            margin-bottom: 0.8rem;
+        }
+        
+        /* Cards */
+        .nav-card {
+            text-align: center;
+            padding: 1.2rem;
+            border-radius: 10px;
+            border: 1px solid var(--border) !important;
+            background: var(--card-bg) !important;
+            transition: transform 0.2s, box-shadow 0.2s;
+        }
+        
+        .nav-card-grid {
+            display: grid;
+            grid-template-columns: repeat(5, minmax(0, 1fr));
+            gap: 1rem;
+        }
+        
+        .nav-card:hover {
+            transform: translateY(-2px);
+            box-shadow: var(--card-hover-shadow);
+        }
+        
+        .nav-card h3 {
+            color: var(--heading) !important;
+            font-size: 1.1rem;
+            margin-bottom: 0.3rem;
+        }
+        
+        .nav-card p {
+            color: var(--card-muted) !important;
+            font-size: 0.85rem;
+        }
+        
+        /* Info boxes */
+        .info-box {
+            background-color: var(--info-bg) !important;
+            padding: 1rem;
+            border-radius: 8px;
+            border-left: 4px solid #2196f3;
+            margin: 1rem 0;
+        }
+        
+        .info-box, .info-box * {
+            color: var(--info-fg) !important;
+        }
+        
+        .success-box {
+            background-color: var(--success-bg) !important;
+            padding: 1rem;
+            border-radius: 8px;
+            border-left: 4px solid #4caf50;
+            margin: 1rem 0;
+        }
+        
+        .success-box, .success-box * {
+            color: var(--success-fg) !important;
+        }
+        
+        .warning-box {
+            background-color: var(--warning-bg) !important;
+            padding: 1rem;
+            border-radius: 8px;
+            border-left: 4px solid #ff9800;
+            margin: 1rem 0;
+        }
+        
+        .warning-box, .warning-box * {
+            color: var(--warning-fg) !important;
+        }
+        
+        /* Metric cards */
+        div[data-testid="metric-container"] {
+            background-color: var(--card-bg) !important;
+            padding: 1.2rem;
+            border-radius: 10px;
+            border: 1px solid var(--border) !important;
+            box-shadow: var(--metric-shadow);
+        }
+        
+        div[data-testid="metric-container"] label {
+            color: var(--muted) !important;
+        }
+        
+        div[data-testid="metric-container"] div[data-testid="stMetricValue"] {
+            color: var(--metric-value) !important;
+        }
+        
+        /* Buttons */
+        .stButton > button {
+            background: var(--button-bg) !important;
+            color: #FFFFFF !important;
+            border-radius: 8px !important;
+            font-weight: 600 !important;
+            border: none !important;
+            transition: all 0.2s ease !important;
+        }
+        
+        .stButton > button:hover {
+            transform: translateY(-1px);
+            box-shadow: var(--button-hover-shadow) !important;
+        }
+        
+        /* Inputs */
+        .stSelectbox > div > div,
+        .stMultiSelect > div > div,
+        .stTextInput > div > div > input,
+        .stDateInput > div > div > input {
+            background-color: var(--input-bg) !important;
+            color: var(--fg) !important;
+            border-color: var(--input-border) !important;
+        }
+        
+        /* Toggle */
+        .stToggle > label > span[data-testid="stToggleSwitch"] {
+            background-color: var(--toggle-off) !important;
+        }
+        
+        .stToggle > label > span[data-testid="stToggleSwitch"][aria-checked="true"] {
+            background-color: var(--toggle-on) !important;
+        }
+        
+        /* Theme indicator */
+        .theme-indicator {
+            background: var(--indicator-bg);
+            color: var(--accent);
+            padding: 0.5rem 1rem;
+            border-radius: 8px;
+            text-align: center;
+            font-weight: 600;
+            border: 1px solid var(--border);
+        }
+"""
+
+_DARK_VARS = """
+        /* ============ DARK MODE ============ */
+        :root {
+            --bg: #0E1117;
+            --fg: #FAFAFA;
+            --heading: #FFFFFF;
+            --accent: #4DA6FF;
+            --muted: #B0B0B0;
+            --border: #333;
+            --sidebar-bg: #1A1A2E;
+            --card-bg: #1E1E2E;
+            --card-muted: #A0A0A0;
+            --card-hover-shadow: 0 4px 12px rgba(0,0,0,0.3);
+            --info-bg: rgba(33, 150, 243, 0.15);
+            --info-fg: #E3F2FD;
+            --success-bg: rgba(76, 175, 80, 0.15);
+            --success-fg: #E8F5E9;
+            --warning-bg: rgba(255, 152, 0, 0.15);
+            --warning-fg: #FFF3E0;
+            --metric-shadow: none;
+            --metric-value: #FFFFFF;
+            --button-bg: linear-gradient(135deg, #4DA6FF 0%, #3D8BD9 100%);
+            --button-hover-shadow: 0 4px 12px rgba(77, 166, 255, 0.4);
+            --input-bg: #2D2D3D;
+            --input-border: #444;
+            --toggle-off: #333;
+            --toggle-on: #4DA6FF;
+            --indicator-bg: linear-gradient(135deg, #1a1a2e 0%, #16213e 100%);
+            --badge-bg: #2D2D3D;
+            --badge-fg: #888;
+        }
+        
+        /* DataFrames - Dark */
+        .stDataFrame, .stDataFrame * {
+            background-color: #1E1E2E !important;
+            color: #FAFAFA !important;
+        }
+        
+        /* Expander - Dark */
+        .streamlit-expanderHeader {
+            background-color: #1E1E2E !important;
+            color: #FAFAFA !important;
+            border-radius: 8px;
+        }
+"""
+
+_LIGHT_VARS = """
+        /* ============ LIGHT MODE ============ */
+        :root {
+            --bg: #FFFFFF;
+            --fg: #1A1A1A;
+            --heading: #1E3A5F;
+            --accent: #1E3A5F;
+            --muted: #5A5A5A;
+            --border: #E0E0E0;
+            --sidebar-bg: #F8F9FA;
+            --card-bg: #FFFFFF;
+            --card-muted: #666666;
+            --card-hover-shadow: 0 4px 12px rgba(0,0,0,0.1);
+            --info-bg: #E3F2FD;
+            --info-fg: #0D47A1;
+            --success-bg: #E8F5E9;
+            --success-fg: #1B5E20;
+            --warning-bg: #FFF3E0;
+            --warning-fg: #E65100;
+            --metric-shadow: 0 1px 3px rgba(0, 0, 0, 0.08);
+            --metric-value: #1A1A1A;
+            --button-bg: linear-gradient(135deg, #1E3A5F 0%, #2D5A8C 100%);
+            --button-hover-shadow: 0 4px 12px rgba(30, 58, 95, 0.3);
+            --input-bg: #FFFFFF;
+            --input-border: #E0E0E0;
+            --toggle-off: #E0E0E0;
+            --toggle-on: #1E3A5F;
+            --indicator-bg: linear-gradient(135deg, #f8f9fa 0%, #e9ecef 100%);
+            --badge-bg: #e0e0e0;
+            --badge-fg: #666;
+        }
+"""
+
+# Both stylesheets are static, so build them once at import time
+_THEME_CSS = {
+    False: f"<style>{_BASE_CSS}{_LIGHT_VARS}</style>",
+    True: f"<style>{_BASE_CSS}{_DARK_VARS}</style>",
+}
+
+
+def get_theme_css(is_dark: bool):
+    return _THEME_CSS[bool(is_dark)]
 
 
 # Apply theme CSS based on current mode
@@ -502,50 +386,14 @@ st.markdown(get_theme_css(is_dark_mode), unsafe_allow_html=True)
 # DATA LOADING WITH CACHING
 # =============================================================================
 
-@st.cache_data(ttl=3600, show_spinner=False)
-def load_and_process_data(data_path: str):
-    """
-    Load and process all commodity data with caching.
-    
-    Args:
-        data_path: Path to the data directory.
-        
-    Returns:
-        Tuple of (processed_df, data_info, quality_stats)
-    """
-    # Find data directory
-    data_dir = find_data_directory(data_path)
-    
-    if data_dir is None:
-        return None, {"error": "Data directory not found"}, {}
-    
-    # Load raw data
-    raw_data = load_all_commodities(data_dir)
-    
-    if not raw_data:
-        return None, {"error": "No data files found"}, {}
-    
-    # Process to canonical format
-    df = process_all_commodities(raw_data)
-    
-    # Validate
-    is_valid, issues = validate_data(df)
-    
-    # Get quality stats
-    quality_stats = get_data_quality_stats(df)
-    
-    # Get data info
-    data_info = get_data_info(data_dir)
-    data_info["is_valid"] = is_valid
-    data_info["issues"] = issues
-    
-    return df, data_info, quality_stats
-
-
+@functools.lru_cache(maxsize=1)
 def get_default_data_path():
     """
     Get the default data path based on the project structure.
     
+    The layout does not change while the app runs, so the candidate paths
+    are only checked once per process.
+    
     Returns:
         Path string.
     """
@@ -569,35 +417,95 @@ def get_default_data_path():
 # SIDEBAR - GLOBAL FILTERS
 # =============================================================================
 
-def render_sidebar(df: pd.DataFrame, quality_stats: dict):  # noqa: ARG001 - quality_stats reserved for future use
+# Sidebar mode indicators - static HTML, one variant per theme where needed
+_ANALYST_BADGE = """
+        <div style="background: linear-gradient(135deg, #667eea 0%, #764ba2 100%);
+                    color: white; padding: 0.75rem; border-radius: 8px; margin: 0.5rem 0;
+                    box-shadow: 0 2px 8px rgba(102, 126, 234, 0.4);">
+            <div style="font-weight: 700; font-size: 0.9rem;">MODE ANALIS AKTIF</div>
+            <div style="font-size: 0.75rem; margin-top: 0.25rem; opacity: 0.9;">
+                Fitur lanjutan aktif:
+                <ul style="margin: 0.25rem 0 0 1rem; padding: 0;">
+                    <li>Rata-rata bergerak (MA7, MA14)</li>
+                    <li>Deteksi anomali</li>
+                    <li>Peta panas harga</li>
+                    <li>Analisis volatilitas</li>
+                </ul>
+            </div>
+        </div>
+        """
+
+_STANDARD_BADGE = {
+    True: """
+        <div style="background: #2D2D3D;
+                    color: #888; 
+                    padding: 0.75rem; border-radius: 8px; margin: 0.5rem 0;
+                    border: 1px solid #444;">
+            <div style="font-weight: 600; font-size: 0.85rem;">MODE STANDAR</div>
+            <div style="font-size: 0.75rem; margin-top: 0.25rem;">
+                Tampilan dasar. Aktifkan Mode Analis untuk grafik lanjutan.
+            </div>
+        </div>
+        """,
+    False: """
+        <div style="background: #F5F5F5;
+                    color: #666; 
+                    padding: 0.75rem; border-radius: 8px; margin: 0.5rem 0;
+                    border: 1px solid #E0E0E0;">
+            <div style="font-weight: 600; font-size: 0.85rem;">MODE STANDAR</div>
+            <div style="font-size: 0.75rem; margin-top: 0.25rem;">
+                Tampilan dasar. Aktifkan Mode Analis untuk grafik lanjutan.
+            </div>
+        </div>
+        """,
+}
+
+
+# Widget keys are dropped while another page is shown, so the callbacks copy
+# the toggle values into plain session_state keys that outlive the sidebar
+def _on_theme_change():
+    st.session_state.theme_mode = 'dark' if st.session_state.dark_mode_toggle else 'light'
+
+
+def _on_analyst_change():
+    st.session_state.analyst_mode = st.session_state.analyst_mode_toggle
+
+
+def render_sidebar(quality_stats: dict) -> Filters:
     """
     Render sidebar dengan filter global dan tema toggle.
     
+    Hanya menerima statistik yang sudah dihitung oleh loader (daftar opsi,
+    nilai default, rentang tanggal), sehingga DataFrame tidak perlu
+    diteruskan ke sidebar. Filter yang dikembalikan selalu berisi komoditas
+    dan minimal satu wilayah, jadi halaman lain tidak perlu fallback sendiri.
+    
     Args:
-        df: DataFrame yang sudah diproses.
-        quality_stats: Statistik kualitas data (reserved untuk penggunaan masa depan).
+        quality_stats: Hasil get_data_quality_stats dari loader.
         
     Returns:
-        Dictionary dari nilai filter yang dipilih.
+        Filters berisi nilai filter yang dipilih.
     """
+    commodities = quality_stats['commodities']
+    regions = quality_stats['regions']
+    min_date = quality_stats['min_date']
+    max_date = quality_stats['max_date']
+    
     # =========================================================================
     # TEMA TOGGLE - Toggle sederhana
     # =========================================================================
     st.sidebar.markdown("### Pengaturan Tampilan")
     
-    # Dark mode toggle
-    dark_mode = st.sidebar.toggle(
+    # Dark mode toggle - the callback runs before the next script pass, so
+    # the CSS at the top of the script already sees the new mode
+    st.sidebar.toggle(
         "Mode Gelap",
         value=st.session_state.theme_mode == 'dark',
+        key="dark_mode_toggle",
+        on_change=_on_theme_change,
         help="Beralih antara tema terang dan gelap"
     )
     
-    # Update session state if changed
-    new_mode = 'dark' if dark_mode else 'light'
-    if new_mode != st.session_state.theme_mode:
-        st.session_state.theme_mode = new_mode
-        st.rerun()
-    
     is_dark = st.session_state.theme_mode == 'dark'
     
     st.sidebar.markdown("---")
@@ -607,53 +515,24 @@ def render_sidebar(df: pd.DataFrame, quality_stats: dict):  # noqa: ARG001 - qua
     # =========================================================================
     st.sidebar.markdown("### Mode Analisis")
     
-    filters = {}
-    
     # Initialize analyst_mode in session_state if not exists
     if 'analyst_mode' not in st.session_state:
         st.session_state.analyst_mode = False
     
     # Analyst mode toggle - use session_state to persist value
-    filters['analyst_mode'] = st.sidebar.toggle(
+    analyst_mode = st.sidebar.toggle(
         "Mode Analis",
         value=st.session_state.analyst_mode,
         key="analyst_mode_toggle",
+        on_change=_on_analyst_change,
         help="Aktifkan fitur analitik lanjutan"
     )
     
-    # Update session_state
-    st.session_state.analyst_mode = filters['analyst_mode']
-    
     # Dynamic indicator based on analyst mode state
-    if filters['analyst_mode']:
-        st.sidebar.markdown("""
-        <div style="background: linear-gradient(135deg, #667eea 0%, #764ba2 100%);
-                    color: white; padding: 0.75rem; border-radius: 8px; margin: 0.5rem 0;
-                    box-shadow: 0 2px 8px rgba(102, 126, 234, 0.4);">
-            <div style="font-weight: 700; font-size: 0.9rem;">MODE ANALIS AKTIF</div>
-            <div style="font-size: 0.75rem; margin-top: 0.25rem; opacity: 0.9;">
-                Fitur lanjutan aktif:
-                <ul style="margin: 0.25rem 0 0 1rem; padding: 0;">
-                    <li>Rata-rata bergerak (MA7, MA14)</li>
-                    <li>Deteksi anomali</li>
-                    <li>Peta panas harga</li>
-                    <li>Analisis volatilitas</li>
-                </ul>
-            </div>
-        </div>
-        """, unsafe_allow_html=True)
+    if analyst_mode:
+        st.sidebar.markdown(_ANALYST_BADGE, unsafe_allow_html=True)
     else:
-        st.sidebar.markdown(f"""
-        <div style="background: {'#2D2D3D' if is_dark else '#F5F5F5'};
-                    color: {'#888' if is_dark else '#666'}; 
-                    padding: 0.75rem; border-radius: 8px; margin: 0.5rem 0;
-                    border: 1px solid {'#444' if is_dark else '#E0E0E0'};">
-            <div style="font-weight: 600; font-size: 0.85rem;">MODE STANDAR</div>
-            <div style="font-size: 0.75rem; margin-top: 0.25rem;">
-                Tampilan dasar. Aktifkan Mode Analis untuk grafik lanjutan.
-            </div>
-        </div>
-        """, unsafe_allow_html=True)
+        st.sidebar.markdown(_STANDARD_BADGE[is_dark], unsafe_allow_html=True)
     
     
     st.sidebar.markdown("---")
@@ -664,20 +543,20 @@ def render_sidebar(df: pd.DataFrame, quality_stats: dict):  # noqa: ARG001 - qua
     st.sidebar.markdown("### Filter")
     
     # Commodity Selection
-    commodities = sorted(df[COL_COMMODITY].unique().tolist())
-    
-    filters['commodity'] = st.sidebar.selectbox(
+    default_commodity = quality_stats['default_commodity']
+    commodity = st.sidebar.selectbox(
         LABELS["commodity_select"],
         options=commodities,
-        index=0,
+        index=commodities.index(default_commodity) if default_commodity in commodities else 0,
         help="Pilih komoditas untuk dianalisis"
     )
     
     # Region Selection
-    regions = sorted(df[COL_REGION].unique().tolist())
-    default_region = regions[0] if regions else None
+    default_region = quality_stats['default_region']
+    if default_region not in regions:
+        default_region = regions[0] if regions else None
     
-    filters['regions'] = st.sidebar.multiselect(
+    selected_regions = st.sidebar.multiselect(
         LABELS["region_select"],
         options=regions,
         default=[default_region] if default_region else [],
@@ -686,15 +565,12 @@ def render_sidebar(df: pd.DataFrame, quality_stats: dict):  # noqa: ARG001 - qua
     )
     
     # Ensure at least one region is selected
-    if not filters['regions'] and regions:
-        filters['regions'] = [regions[0]]
+    if not selected_regions and default_region:
+        selected_regions = [default_region]
     
     # Date Range Selection
     st.sidebar.markdown("---")
     
-    min_date = df[COL_DATE].min().date()
-    max_date = df[COL_DATE].max().date()
-    
     # Default to last 90 days
     from datetime import timedelta
     default_start = max(min_date, max_date - timedelta(days=DEFAULT_DATE_RANGE_DAYS))
@@ -709,11 +585,9 @@ def render_sidebar(df: pd.DataFrame, quality_stats: dict):  # noqa: ARG001 - qua
     
     # Handle single date selection
     if isinstance(date_range, tuple) and len(date_range) == 2:
-        filters['date_start'] = date_range[0]
-        filters['date_end'] = date_range[1]
+        date_start, date_end = date_range
     else:
-        filters['date_start'] = min_date
-        filters['date_end'] = max_date
+        date_start, date_end = min_date, max_date
     
     # =========================================================================
     # RINGKASAN DATA
@@ -729,13 +603,62 @@ def render_sidebar(df: pd.DataFrame, quality_stats: dict):  # noqa: ARG001 - qua
     
     st.sidebar.caption(f"📅 Data: {min_date} to {max_date}")
     
-    return filters
+    return Filters(
+        commodity=commodity,
+        regions=tuple(selected_regions),
+        date_start=date_start,
+        date_end=date_end,
+        analyst_mode=analyst_mode,
+    )
 
 
 # =============================================================================
 # MAIN PAGE CONTENT
 # =============================================================================
 
+# Navigation cards (title, subtitle) in sidebar page order
+_NAV_CARDS = [
+    ("RINGKASAN", "KPI & Insight Utama"),
+    ("TREN", "Analisis deret waktu"),
+    ("WILAYAH", "Perbandingan regional"),
+    ("KOMODITAS", "Perbandingan harga"),
+    ("DATA", "Tabel & metadata"),
+]
+
+# (card backgrounds, title color, subtitle color) per theme (True = dark)
+_NAV_CARD_COLORS = {
+    True: (['#1E3D59', '#1E4D3D', '#4D3D1E', '#4D1E3D', '#3D1E4D'], '#FFFFFF', '#B0B0B0'),
+    False: (['#E3F2FD', '#E8F5E9', '#FFF3E0', '#FCE4EC', '#F3E5F5'], '#1E3A5F', '#666666'),
+}
+
+
+def _build_nav_cards_html(is_dark: bool) -> str:
+    """Bangun HTML semua kartu navigasi sebagai satu grid."""
+    card_colors, text_color, subtext_color = _NAV_CARD_COLORS[is_dark]
+    cards = "".join(
+        f"""
+        <div class="nav-card" style="background: {card_color};">
+            <h3 style="color: {text_color};">{title}</h3>
+            <p style="color: {subtext_color};">{subtitle}</p>
+        </div>"""
+        for card_color, (title, subtitle) in zip(card_colors, _NAV_CARDS)
+    )
+    return f'<div class="nav-card-grid">{cards}\n</div>'
+
+
+# Static per-theme HTML, built once at import instead of on every rerun
+_NAV_CARDS_HTML = {is_dark: _build_nav_cards_html(is_dark) for is_dark in (False, True)}
+
+_FOOTER_HTML = {
+    is_dark: f"""
+    <div style="text-align: center; color: {'#B0B0B0' if is_dark else '#666666'}; font-size: 0.85rem;">
+        <p>Dashboard Harga Komoditas Pangan v1.0 | Data bersumber dari file lokal</p>
+    </div>
+    """
+    for is_dark in (False, True)
+}
+
+
 def main():
     """Titik masuk utama aplikasi."""
     
@@ -772,13 +695,12 @@ def main():
         st.info(f"Lokasi yang dicoba: `{data_path}`")
         st.stop()
     
-    # Store data in session state for other pages
-    st.session_state['df'] = df
-    st.session_state['data_info'] = data_info
-    st.session_state['quality_stats'] = quality_stats
+    # Other pages fetch the same cached objects through this path; the
+    # frame itself is not copied into session state
+    st.session_state['data_path'] = data_path
     
     # Render Sidebar Filters
-    filters = render_sidebar(df, quality_stats)
+    filters = render_sidebar(quality_stats)
     st.session_state['filters'] = filters
     
     # Main Content - Welcome/Overview
@@ -799,57 +721,8 @@ def main():
     # Quick Navigation Cards
     st.markdown("### Navigasi Cepat")
     
-    col1, col2, col3, col4, col5 = st.columns(5)
-    
-    # Get background colors based on theme
-    if st.session_state.theme_mode == 'dark':
-        card_colors = ['#1E3D59', '#1E4D3D', '#4D3D1E', '#4D1E3D', '#3D1E4D']
-        text_color = '#FFFFFF'
-        subtext_color = '#B0B0B0'
-    else:
-        card_colors = ['#E3F2FD', '#E8F5E9', '#FFF3E0', '#FCE4EC', '#F3E5F5']
-        text_color = '#1E3A5F'
-        subtext_color = '#666666'
-    
-    with col1:
-        st.markdown(f"""
-        <div class="nav-card" style="background: {card_colors[0]};">
-            <h3 style="color: {text_color};">RINGKASAN</h3>
-            <p style="color: {subtext_color};">KPI & Insight Utama</p>
-        </div>
-        """, unsafe_allow_html=True)
-    
-    with col2:
-        st.markdown(f"""
-        <div class="nav-card" style="background: {card_colors[1]};">
-            <h3 style="color: {text_color};">TREN</h3>
-            <p style="color: {subtext_color};">Analisis deret waktu</p>
-        </div>
-        """, unsafe_allow_html=True)
-    
-    with col3:
-        st.markdown(f"""
-        <div class="nav-card" style="background: {card_colors[2]};">
-            <h3 style="color: {text_color};">WILAYAH</h3>
-            <p style="color: {subtext_color};">Perbandingan regional</p>
-        </div>
-        """, unsafe_allow_html=True)
-    
-    with col4:
-        st.markdown(f"""
-        <div class="nav-card" style="background: {card_colors[3]};">
-            <h3 style="color: {text_color};">KOMODITAS</h3>
-            <p style="color: {subtext_color};">Perbandingan harga</p>
-        </div>
-        """, unsafe_allow_html=True)
-    
-    with col5:
-        st.markdown(f"""
-        <div class="nav-card" style="background: {card_colors[4]};">
-            <h3 style="color: {text_color};">DATA</h3>
-            <p style="color: {subtext_color};">Tabel & metadata</p>
-        </div>
-        """, unsafe_allow_html=True)
+    is_dark = st.session_state.theme_mode == 'dark'
+    st.markdown(_NAV_CARDS_HTML[is_dark], unsafe_allow_html=True)
     
     st.markdown("""
     <div class="info-box">
@@ -858,45 +731,44 @@ def main():
     </div>
     """, unsafe_allow_html=True)
     
-    # Data Coverage Summary
-    st.markdown("### Cakupan Data")
-    
-    col1, col2 = st.columns(2)
-    
-    with col1:
-        date_range = quality_stats.get('date_range', {})
-        if date_range:
-            st.metric(
-                "Tanggal Mulai",
-                date_range.get('min', '-'),
-            )
-    
-    with col2:
-        if date_range:
-            st.metric(
-                "Tanggal Akhir",
-                date_range.get('max', '-'),
-            )
-    
-    # Commodity List
-    st.markdown("### Komoditas Tersedia")
-    
-    commodities = quality_stats.get('commodities', [])
-    if commodities:
-        # Display in grid
-        cols = st.columns(4)
-        for i, commodity in enumerate(commodities):
-            with cols[i % 4]:
-                st.markdown(f"• {commodity}")
+    # Coverage details are collapsed by default and only built while the
+    # expander is open (on_change="rerun" makes .open track its state)
+    coverage = st.expander("Detail Cakupan", expanded=False, key="home_coverage_expander", on_change="rerun")
+    with coverage:
+        if coverage.open:
+            # Data Coverage Summary
+            st.markdown("### Cakupan Data")
+            
+            col1, col2 = st.columns(2)
+            
+            with col1:
+                date_range = quality_stats.get('date_range', {})
+                if date_range:
+                    st.metric(
+                        "Tanggal Mulai",
+                        date_range.get('min', '-'),
+                    )
+            
+            with col2:
+                if date_range:
+                    st.metric(
+                        "Tanggal Akhir",
+                        date_range.get('max', '-'),
+                    )
+            
+            # Commodity List
+            st.markdown("### Komoditas Tersedia")
+            
+            commodities = quality_stats.get('commodities', [])
+            if commodities:
+                # Display in grid: one markdown element per column
+                cols = st.columns(4)
+                for i, col in enumerate(cols):
+                    col.markdown("  \n".join(f"• {commodity}" for commodity in commodities[i::4]))
     
     # Footer
     st.markdown("---")
-    footer_color = '#B0B0B0' if st.session_state.theme_mode == 'dark' else '#666666'
-    st.markdown(f"""
-    <div style="text-align: center; color: {footer_color}; font-size: 0.85rem;">
-        <p>Dashboard Harga Komoditas Pangan v1.0 | Data bersumber dari file lokal</p>
-    </div>
-    """, unsafe_allow_html=True)
+    st.markdown(_FOOTER_HTML[is_dark], unsafe_allow_html=True)
 
 
 if __name__ == "__main__":
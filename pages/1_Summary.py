@@ -12,13 +12,10 @@ sys.path.insert(0, str(Path(__file__).parent.parent))
 
 from src.constants import (
     LABELS,
-    COL_DATE,
-    COL_COMMODITY,
     COL_REGION,
     KPI_POSITIVE_COLOR,
     KPI_NEGATIVE_COLOR,
     KPI_NEUTRAL_COLOR,
-    DEFAULT_REGION,
 )
 from src.metrics import (
     get_kpi_summary,
@@ -28,9 +25,12 @@ from src.metrics import (
 from src.charts import (
     create_price_trend_chart,
     create_top_movers_bar,
+    render_price_trend,
     format_kpi_value,
     format_change_value,
+    format_values,
 )
+from src.data_loader import Filters, select_rows, load_and_process_data
 from src.theme import apply_theme, render_styled_dataframe
 
 # =============================================================================
@@ -95,26 +95,25 @@ def main():
     st.markdown("Ringkasan harga utama, tren, dan komoditas dengan performa terbaik")
     
     # Check if data is loaded
-    if 'df' not in st.session_state:
+    if 'data_path' not in st.session_state:
         st.warning("Data belum dimuat. Silakan kembali ke Beranda untuk memuat data.")
         st.stop()
     
-    df = st.session_state['df']
-    filters = st.session_state.get('filters', {})
+    # Shared cached object (same one Home loaded), no session copy
+    df, _, _ = load_and_process_data(st.session_state['data_path'])
+    filters = st.session_state.get('filters') or Filters()
     
-    # Get filter values
-    commodity = filters.get('commodity', df[COL_COMMODITY].iloc[0])
-    regions = filters.get('regions', [df[COL_REGION].iloc[0]])
-    date_start = filters.get('date_start')
-    date_end = filters.get('date_end')
-    analyst_mode = filters.get('analyst_mode', False)
+    # Get filter values (the Home sidebar always fills commodity and regions)
+    commodity = filters.commodity
+    regions = filters.regions
+    analyst_mode = filters.analyst_mode
     
-    # Ensure we have valid regions
-    if not regions:
-        regions = [DEFAULT_REGION] if DEFAULT_REGION in df[COL_REGION].unique() else [df[COL_REGION].iloc[0]]
+    if commodity is None or not regions:
+        st.error("Data wilayah atau komoditas tidak tersedia.")
+        st.stop()
     
     # Get selected region (first one for KPI display)
-    selected_region = regions[0] if regions else df[COL_REGION].iloc[0]
+    selected_region = regions[0]
     
     # ==========================================================================
     # KPI SECTION
@@ -171,64 +170,58 @@ def main():
     st.markdown(f"### Tren Harga: {commodity}")
     
     # Filter data for chart
-    df_filtered = df[
-        (df[COL_COMMODITY] == commodity) &
-        (df[COL_REGION].isin(regions))
-    ].copy()
-    
-    if date_start and date_end:
-        df_filtered = df_filtered[
-            (df_filtered[COL_DATE] >= pd.Timestamp(date_start)) &
-            (df_filtered[COL_DATE] <= pd.Timestamp(date_end))
-        ]
-    
-    if not df_filtered.empty:
-        date_range = None
-        if date_start and date_end:
-            date_range = (date_start, date_end)
-        
+    date_range = filters.date_range
+    df_filtered = select_rows(df, commodity, regions, date_range)
+    
+    if df_filtered.empty:
+        st.info(LABELS["no_data"])
+    elif analyst_mode:
+        # MA overlays need the Plotly figure
         fig = create_price_trend_chart(
             df,
             commodity,
             regions,
-            show_ma7=analyst_mode,
-            show_ma14=analyst_mode,
+            show_ma7=True,
+            show_ma14=True,
             date_range=date_range
         )
         st.plotly_chart(fig, use_container_width=True)
     else:
-        st.info(LABELS["no_data"])
+        render_price_trend(df_filtered, regions)
     
     # ==========================================================================
     # TOP MOVERS SECTION
     # ==========================================================================
     
     st.markdown("---")
-    st.markdown("### Pergerakan Tertinggi (7 Hari)")
-    
-    col1, col2 = st.columns(2)
-    
-    # Get top movers for the selected commodity
-    top_gainers, top_losers = get_top_movers(df, commodity, days=7)
-    
-    with col1:
-        st.markdown(f"**{LABELS['top_movers_up']}**")
-        if not top_gainers.empty:
-            fig_movers = create_top_movers_bar(top_gainers, top_losers)
-            st.plotly_chart(fig_movers, use_container_width=True)
-        else:
-            st.info("Data regional tidak tersedia untuk pergerakan tertinggi.")
-    
-    with col2:
-        st.markdown(f"**{LABELS['top_movers_down']}**")
-        if not top_losers.empty:
-            # Show losers table with styled HTML
-            losers_display = top_losers.copy()
-            losers_display['change_pct'] = losers_display['change_pct'].apply(lambda x: f"{x:+.1f}%")
-            losers_display.columns = ['Wilayah', 'Perubahan']
-            render_styled_dataframe(losers_display, max_height="300px")
-        else:
-            st.info("Data regional tidak tersedia untuk penurunan tertinggi.")
+    # Collapsed by default; movers are only computed while it is open
+    movers = st.expander("Pergerakan Tertinggi (7 Hari)", expanded=False, key="summary_movers_expander", on_change="rerun")
+    with movers:
+        if movers.open:
+            col1, col2 = st.columns(2)
+            
+            # Get top movers for the selected commodity
+            top_gainers, top_losers = get_top_movers(df, commodity, days=7)
+            
+            with col1:
+                st.markdown(f"**{LABELS['top_movers_up']}**")
+                if not top_gainers.empty:
+                    fig_movers = create_top_movers_bar(top_gainers, top_losers)
+                    st.plotly_chart(fig_movers, use_container_width=True)
+                else:
+                    st.info("Data regional tidak tersedia untuk pergerakan tertinggi.")
+            
+            with col2:
+                st.markdown(f"**{LABELS['top_movers_down']}**")
+                if not top_losers.empty:
+                    # Show losers table with styled HTML
+                    losers_display = pd.DataFrame({
+                        'Wilayah': top_losers[COL_REGION],
+                        'Perubahan': format_values(top_losers['change_pct'], "{:+.1f}%"),
+                    })
+                    render_styled_dataframe(losers_display, max_height="300px")
+                else:
+                    st.info("Data regional tidak tersedia untuk penurunan tertinggi.")
     
     # ==========================================================================
     # AUTO-INSIGHTS (Analyst Mode Only)
@@ -249,5 +242,3 @@ def main():
 
 if __name__ == "__main__":
     main()
-else:
-    main()
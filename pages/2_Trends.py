@@ -13,9 +13,8 @@ sys.path.insert(0, str(Path(__file__).parent.parent))
 from src.constants import (
     LABELS,
     COL_DATE,
-    COL_COMMODITY,
-    COL_REGION,
     COL_PRICE,
+    COL_DAILY_CHANGE,
 )
 from src.metrics import (
     detect_anomalies,
@@ -23,7 +22,9 @@ from src.metrics import (
 from src.charts import (
     create_price_trend_chart,
     create_price_trend_with_anomalies,
+    render_price_trend,
 )
+from src.data_loader import Filters, select_rows, load_and_process_data
 from src.theme import apply_theme
 
 # =============================================================================
@@ -48,29 +49,23 @@ def main():
     st.markdown("Analisis tren harga dengan rata-rata bergerak dan deteksi anomali")
     
     # Check if data is loaded
-    if 'df' not in st.session_state:
+    if 'data_path' not in st.session_state:
         st.warning("Data belum dimuat. Silakan kembali ke Beranda untuk memuat data.")
         st.stop()
     
-    df = st.session_state['df']
-    filters = st.session_state.get('filters', {})
+    # Shared cached object (same one Home loaded), no session copy
+    df, _, _ = load_and_process_data(st.session_state['data_path'])
+    filters = st.session_state.get('filters') or Filters()
     
     # Get filter values with safe defaults
     if df is None or df.empty:
         st.error("Tidak ada data tersedia.")
         st.stop()
     
-    commodity = filters.get('commodity')
-    if commodity is None:
-        commodity = df[COL_COMMODITY].iloc[0] if not df.empty else None
+    commodity = filters.commodity
+    regions = filters.regions
     
-    regions = filters.get('regions', [])
-    if not regions:
-        regions = [df[COL_REGION].iloc[0]] if not df.empty else []
-    
-    date_start = filters.get('date_start')
-    date_end = filters.get('date_end')
-    analyst_mode = filters.get('analyst_mode', False)
+    analyst_mode = filters.analyst_mode
     
     primary_region = regions[0] if regions else None
     
@@ -78,18 +73,12 @@ def main():
         st.error("Data wilayah atau komoditas tidak tersedia.")
         st.stop()
     
-    # Filter data by date
-    df_filtered = df.copy()
-    if date_start and date_end:
-        try:
-            df_filtered = df_filtered[
-                (df_filtered[COL_DATE] >= pd.Timestamp(date_start)) &
-                (df_filtered[COL_DATE] <= pd.Timestamp(date_end))
-            ]
-        except Exception:
-            pass
+    date_range = filters.date_range
     
-    date_range = (date_start, date_end) if date_start and date_end else None
+    # Everything below is for one commodity, so slice it and its date window
+    # out of the group-sorted frame in one binary-search pass instead of
+    # masking every row; the shared df is never modified
+    df_filtered = select_rows(df, commodity, date_range=date_range)
     
     # ==========================================================================
     # CONTROLS
@@ -134,17 +123,20 @@ def main():
     if resample_freq == "Mingguan":
         st.info("Data ditampilkan dalam agregasi mingguan (rata-rata)")
     
-    # Create trend chart
+    # Create trend chart (Plotly only when MA overlays are requested)
     try:
-        fig = create_price_trend_chart(
-            df_filtered,
-            commodity,
-            regions,
-            show_ma7=show_ma7,
-            show_ma14=show_ma14,
-            date_range=date_range
-        )
-        st.plotly_chart(fig, use_container_width=True)
+        if show_ma7 or show_ma14:
+            fig = create_price_trend_chart(
+                df_filtered,
+                commodity,
+                regions,
+                show_ma7=show_ma7,
+                show_ma14=show_ma14,
+                date_range=date_range
+            )
+            st.plotly_chart(fig, use_container_width=True)
+        else:
+            render_price_trend(select_rows(df_filtered, commodity, regions), regions)
     except Exception as e:
         st.error(f"Tidak dapat membuat grafik: {str(e)}")
     
@@ -188,11 +180,13 @@ def main():
                 if not anomalies.empty:
                     st.markdown("#### Daftar Anomali")
                     
-                    anomaly_table = anomalies[[COL_DATE, COL_PRICE, 'daily_change_pct']].copy()
-                    anomaly_table.columns = ['Tanggal', 'Harga', 'Perubahan (%)']
-                    anomaly_table['Tanggal'] = anomaly_table['Tanggal'].dt.strftime('%d %b %Y')
-                    anomaly_table['Harga'] = anomaly_table['Harga'].apply(lambda x: f"Rp {x:,.0f}")
-                    anomaly_table['Perubahan (%)'] = anomaly_table['Perubahan (%)'].apply(lambda x: f"{x:+.1f}%")
+                    # Whole-column formatting: rounding and the "Rp " prefix are
+                    # vectorized, leaving only a bound str.format per cell
+                    anomaly_table = pd.DataFrame({
+                        'Tanggal': anomalies[COL_DATE].dt.strftime('%d %b %Y'),
+                        'Harga': 'Rp ' + anomalies[COL_PRICE].round().astype('int64').map('{:,}'.format),
+                        'Perubahan (%)': anomalies[COL_DAILY_CHANGE].map('{:+.1f}%'.format),
+                    })
                     
                     st.dataframe(
                         anomaly_table.reset_index(drop=True),
@@ -214,35 +208,38 @@ def main():
     st.markdown("### Statistik Periode")
     
     try:
-        mask = (df_filtered[COL_COMMODITY] == commodity) & (df_filtered[COL_REGION] == primary_region)
-        period_data = df_filtered[mask].dropna(subset=[COL_PRICE])
+        period_data = select_rows(df_filtered, commodity, [primary_region])
         
         if not period_data.empty:
             col1, col2, col3, col4, col5 = st.columns(5)
             
+            # Each aggregate is computed once and reused in the summary text
             prices = period_data[COL_PRICE]
+            price_min = prices.min()
+            price_max = prices.max()
+            price_mean = prices.mean()
             
             with col1:
-                st.metric("Minimum", f"Rp {prices.min():,.0f}")
+                st.metric("Minimum", f"Rp {price_min:,.0f}")
             
             with col2:
-                st.metric("Maksimum", f"Rp {prices.max():,.0f}")
+                st.metric("Maksimum", f"Rp {price_max:,.0f}")
             
             with col3:
-                st.metric("Rata-rata", f"Rp {prices.mean():,.0f}")
+                st.metric("Rata-rata", f"Rp {price_mean:,.0f}")
             
             with col4:
                 st.metric("Median", f"Rp {prices.median():,.0f}")
             
             with col5:
-                std_pct = (prices.std() / prices.mean()) * 100 if prices.mean() > 0 else 0
+                std_pct = (prices.std() / price_mean) * 100 if price_mean > 0 else 0
                 st.metric("Volatilitas", f"{std_pct:.1f}%")
             
             # Period summary
             st.markdown(f"""
             **Ringkasan:** Dalam periode yang dipilih, harga {commodity} di {primary_region} 
-            berkisar dari Rp {prices.min():,.0f} hingga Rp {prices.max():,.0f} 
-            dengan rata-rata Rp {prices.mean():,.0f}.
+            berkisar dari Rp {price_min:,.0f} hingga Rp {price_max:,.0f} 
+            dengan rata-rata Rp {price_mean:,.0f}.
             """)
         else:
             st.warning(LABELS["no_data"])
@@ -252,5 +249,3 @@ def main():
 
 if __name__ == "__main__":
     main()
-else:
-    main()
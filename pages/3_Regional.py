@@ -4,7 +4,6 @@ Compare prices across different regions with rankings and scatter plots.
 """
 
 import streamlit as st
-import pandas as pd
 import sys
 from pathlib import Path
 
@@ -12,22 +11,23 @@ sys.path.insert(0, str(Path(__file__).parent.parent))
 
 from src.constants import (
     LABELS,
-    COL_DATE,
-    COL_COMMODITY,
     COL_REGION,
-    COL_PRICE,
-    DEFAULT_REGION,
     REGIONAL_RANKING_COUNT,
+    MAX_REGIONS_SELECT,
 )
 from src.metrics import (
     get_regional_ranking,
     get_regional_volatility_comparison,
+    get_regional_summary,
 )
 from src.charts import (
-    create_price_trend_chart,
     create_regional_ranking_bar,
     create_volatility_scatter,
+    render_price_trend,
+    format_values,
 )
+from src.io import to_csv_bytes
+from src.data_loader import Filters, select_rows, load_and_process_data
 from src.theme import apply_theme, render_styled_dataframe
 
 # =============================================================================
@@ -52,12 +52,13 @@ def main():
     st.markdown("Perbandingan harga regional untuk mengidentifikasi perbedaan antar wilayah.")
     
     # Check if data is loaded
-    if 'df' not in st.session_state:
+    if 'data_path' not in st.session_state:
         st.warning("Data belum dimuat. Silakan kembali ke Beranda untuk memuat data.")
         st.stop()
     
-    df = st.session_state['df']
-    filters = st.session_state.get('filters', {})
+    # Shared cached object (same one Home loaded), no session copy
+    df, _, _ = load_and_process_data(st.session_state['data_path'])
+    filters = st.session_state.get('filters') or Filters()
     
     # Validate data
     if df is None or df.empty:
@@ -65,43 +66,29 @@ def main():
         st.stop()
     
     # Get filter values with safe defaults
-    commodity = filters.get('commodity')
-    if commodity is None:
-        commodity = df[COL_COMMODITY].iloc[0] if not df.empty else None
+    commodity = filters.commodity
+    selected_regions = filters.regions
     
-    regions = filters.get('regions', [])
-    if not regions:
-        regions = [df[COL_REGION].iloc[0]] if not df.empty else []
+    # Clip before any data work (the sidebar already caps the selection)
+    regions = selected_regions[:MAX_REGIONS_SELECT]
     
-    date_start = filters.get('date_start')
-    date_end = filters.get('date_end')
-    analyst_mode = filters.get('analyst_mode', False)
+    analyst_mode = filters.analyst_mode
     
     if commodity is None:
         st.error("Data komoditas tidak tersedia.")
         st.stop()
     
-    # Filter data by date
-    df_filtered = df.copy()
-    if date_start and date_end:
-        try:
-            df_filtered = df_filtered[
-                (df_filtered[COL_DATE] >= pd.Timestamp(date_start)) &
-                (df_filtered[COL_DATE] <= pd.Timestamp(date_end))
-            ]
-        except Exception:
-            pass
-    
-    date_range = (date_start, date_end) if date_start and date_end else None
+    date_range = filters.date_range
     
-    # Check if regional data is available
-    unique_regions = df_filtered[
-        df_filtered[COL_COMMODITY] == commodity
-    ][COL_REGION].unique()
+    # Everything below is for one commodity, so slice it and its date window
+    # out of the group-sorted frame in one binary-search pass instead of
+    # masking every row; the shared df is never modified
+    df_filtered = select_rows(df, commodity, date_range=date_range)
     
-    has_regional_data = len(unique_regions) > 1 and not (
-        len(unique_regions) == 1 and DEFAULT_REGION in unique_regions
-    )
+    # Regional comparison needs at least two regions: compare the integer
+    # region codes against the first one instead of building unique labels
+    region_codes = df_filtered[COL_REGION].cat.codes.to_numpy()
+    has_regional_data = region_codes.size > 0 and bool((region_codes != region_codes[0]).any())
     
     if not has_regional_data:
         from src.theme import is_dark_mode
@@ -126,7 +113,7 @@ def main():
     
     try:
         highest, lowest = get_regional_ranking(
-            df_filtered, 
+            df, 
             commodity, 
             date_range=date_range,
             top_n=REGIONAL_RANKING_COUNT
@@ -147,22 +134,13 @@ def main():
     # ==========================================================================
     
     st.markdown(f"### {LABELS['price_comparison']}")
-    st.markdown(f"Perbandingan tren harga untuk wilayah yang dipilih: **{', '.join(regions)}**")
+    st.markdown(f"Perbandingan tren harga untuk wilayah yang dipilih: **{', '.join(selected_regions)}**")
     
-    if len(regions) > 5:
-        st.warning("Terlalu banyak wilayah dipilih. Menampilkan 5 wilayah pertama.")
-        regions = regions[:5]
+    if len(selected_regions) > MAX_REGIONS_SELECT:
+        st.warning(f"Terlalu banyak wilayah dipilih. Menampilkan {MAX_REGIONS_SELECT} wilayah pertama.")
     
     try:
-        fig_comparison = create_price_trend_chart(
-            df_filtered,
-            commodity,
-            regions,
-            show_ma7=False,
-            show_ma14=False,
-            date_range=date_range
-        )
-        st.plotly_chart(fig_comparison, use_container_width=True)
+        render_price_trend(select_rows(df, commodity, regions, date_range), regions)
     except Exception as e:
         st.warning(f"Tidak dapat membuat grafik perbandingan: {str(e)}")
     
@@ -179,7 +157,7 @@ def main():
         """)
         
         try:
-            volatility_data = get_regional_volatility_comparison(df_filtered, commodity, days=30)
+            volatility_data = get_regional_volatility_comparison(df, commodity, days=30, date_range=date_range)
             
             if not volatility_data.empty:
                 fig_scatter = create_volatility_scatter(volatility_data)
@@ -197,27 +175,28 @@ def main():
     st.markdown("### Ringkasan Regional")
     
     try:
-        # Calculate summary statistics per region
-        mask = df_filtered[COL_COMMODITY] == commodity
-        regional_data = df_filtered[mask].groupby(COL_REGION).agg({
-            COL_PRICE: ['mean', 'min', 'max', 'std', 'last']
-        }).round(0)
+        # Summary statistics per region (memoized per commodity and date range)
+        regional_data = get_regional_summary(df, commodity, date_range)
         
         if regional_data.empty:
             st.info("Tidak ada data regional untuk komoditas ini.")
         else:
-            regional_data.columns = ['Rata-rata', 'Minimum', 'Maksimum', 'Std Dev', 'Harga Terkini']
-            regional_data = regional_data.sort_values('Harga Terkini', ascending=False)
+            regional_data = regional_data.rename(columns={
+                'avg_price': 'Rata-rata',
+                'min_price': 'Minimum',
+                'max_price': 'Maksimum',
+                'std_price': 'Std Dev',
+                'latest_price': 'Harga Terkini',
+            }).sort_values('Harga Terkini', ascending=False)
             
-            # Format as currency
-            for col in regional_data.columns:
-                regional_data[col] = regional_data[col].apply(lambda x: f"Rp {x:,.0f}" if pd.notna(x) else "-")
+            # Format as currency (every column holds whole-Rupiah prices)
+            regional_data = regional_data.apply(format_values, template="Rp {:,.0f}")
             
             # Use styled HTML table for better visibility
             render_styled_dataframe(regional_data.reset_index())
             
             # Download button
-            csv_data = regional_data.reset_index().to_csv(index=False)
+            csv_data = to_csv_bytes(regional_data.reset_index())
             st.download_button(
                 label="Unduh Ringkasan Regional (CSV)",
                 data=csv_data,
@@ -230,5 +209,3 @@ def main():
 
 if __name__ == "__main__":
     main()
-else:
-    main()
@@ -4,7 +4,6 @@ Compare multiple commodities with charts, heatmaps, and summary tables.
 """
 
 import streamlit as st
-import pandas as pd
 import sys
 from pathlib import Path
 
@@ -12,20 +11,21 @@ sys.path.insert(0, str(Path(__file__).parent.parent))
 
 from src.constants import (
     LABELS,
-    COL_DATE,
     COL_COMMODITY,
-    COL_REGION,
-    COL_PRICE,
     MAX_COMMODITIES_COMPARE,
 )
 from src.metrics import (
     get_commodity_summary,
+    get_available_commodities,
 )
 from src.charts import (
     create_multi_commodity_chart,
     create_price_heatmap,
     create_small_multiples,
+    format_values,
 )
+from src.io import to_csv_bytes
+from src.data_loader import Filters, load_and_process_data
 from src.theme import apply_theme, render_styled_dataframe
 
 # =============================================================================
@@ -50,12 +50,13 @@ def main():
     st.markdown("Bandingkan beberapa komoditas untuk melihat tren dan perubahan harga.")
     
     # Check if data is loaded
-    if 'df' not in st.session_state:
+    if 'data_path' not in st.session_state:
         st.warning("Data belum dimuat. Silakan kembali ke Beranda untuk memuat data.")
         st.stop()
     
-    df = st.session_state['df']
-    filters = st.session_state.get('filters', {})
+    # Shared cached object (same one Home loaded), no session copy
+    df, _, data_stats = load_and_process_data(st.session_state['data_path'])
+    filters = st.session_state.get('filters') or Filters()
     
     # Validate data
     if df is None or df.empty:
@@ -63,13 +64,9 @@ def main():
         st.stop()
     
     # Get filter values with safe defaults
-    regions = filters.get('regions', [])
-    if not regions:
-        regions = [df[COL_REGION].iloc[0]] if not df.empty else []
+    regions = filters.regions
     
-    date_start = filters.get('date_start')
-    date_end = filters.get('date_end')
-    analyst_mode = filters.get('analyst_mode', False)
+    analyst_mode = filters.analyst_mode
     
     primary_region = regions[0] if regions else None
     
@@ -77,18 +74,10 @@ def main():
         st.error("Data wilayah tidak tersedia.")
         st.stop()
     
-    # Filter data by date
-    df_filtered = df.copy()
-    if date_start and date_end:
-        try:
-            df_filtered = df_filtered[
-                (df_filtered[COL_DATE] >= pd.Timestamp(date_start)) &
-                (df_filtered[COL_DATE] <= pd.Timestamp(date_end))
-            ]
-        except Exception:
-            pass
-    
-    date_range = (date_start, date_end) if date_start and date_end else None
+    # The full df goes to the memoized helpers below together with the date
+    # range: it is keyed by its fingerprint, whereas a date-filtered copy
+    # would be hashed row by row on every rerun
+    date_range = filters.date_range
     
     # ==========================================================================
     # COMMODITY SELECTION
@@ -96,7 +85,14 @@ def main():
     
     st.markdown("### Pilih Komoditas untuk Perbandingan")
     
-    all_commodities = sorted(df_filtered[COL_COMMODITY].unique().tolist())
+    # A window spanning the whole dataset keeps every commodity, so the
+    # sorted list from the loader stats is reused without touching df
+    if date_range is None or (
+        date_range[0] <= data_stats['min_date'] and date_range[1] >= data_stats['max_date']
+    ):
+        all_commodities = data_stats['commodities']
+    else:
+        all_commodities = get_available_commodities(df, date_range)
     
     if not all_commodities:
         st.warning("Tidak ada komoditas tersedia dalam data yang difilter.")
@@ -131,7 +127,7 @@ def main():
     
     try:
         fig_comparison = create_multi_commodity_chart(
-            df_filtered,
+            df,
             selected_commodities,
             primary_region,
             date_range=date_range
@@ -150,7 +146,7 @@ def main():
     
     try:
         fig_multiples = create_small_multiples(
-            df_filtered,
+            df,
             selected_commodities,
             primary_region,
             date_range=date_range
@@ -177,10 +173,11 @@ def main():
         
         try:
             fig_heatmap = create_price_heatmap(
-                df_filtered,
+                df,
                 selected_commodities,
                 primary_region,
-                resample=resample_code
+                resample=resample_code,
+                date_range=date_range
             )
             
             if fig_heatmap.data:
@@ -199,7 +196,7 @@ def main():
     st.markdown(f"Ringkasan statistik untuk wilayah **{primary_region}**")
     
     try:
-        summary_df = get_commodity_summary(df_filtered, selected_commodities, primary_region)
+        summary_df = get_commodity_summary(df, selected_commodities, primary_region, date_range)
         
         if not summary_df.empty:
             # Format the table
@@ -207,31 +204,27 @@ def main():
             
             # Format currency columns
             if 'Latest Price' in display_df.columns:
-                display_df['Latest Price'] = display_df['Latest Price'].apply(
-                    lambda x: f"Rp {x:,.0f}" if pd.notna(x) else "-"
-                )
+                display_df['Latest Price'] = format_values(display_df['Latest Price'], "Rp {:,.0f}")
             
-            # Format percentage columns
-            for col in ['7-Day Change (%)', '30-Day Change (%)', 'Volatility (%)']:
-                if col in display_df.columns:
-                    display_df[col] = display_df[col].apply(
-                        lambda x: f"{x:+.1f}%" if pd.notna(x) else "-"
-                    )
+            # Format percentage columns (present ones resolved in one lookup)
+            pct_cols = display_df.columns.intersection(['7-Day Change (%)', '30-Day Change (%)', 'Volatility (%)'])
+            for col in pct_cols:
+                display_df[col] = format_values(display_df[col], "{:+.1f}%")
             
-            # Format status
+            # Format status (unknown values are kept as-is)
             if 'Status' in display_df.columns:
                 status_map = {
                     'rising': 'Naik',
                     'falling': 'Turun',
                     'stable': 'Stabil'
                 }
-                display_df['Status'] = display_df['Status'].map(lambda x: status_map.get(x, x))
+                display_df['Status'] = display_df['Status'].replace(status_map)
             
             # Use styled HTML table for better visibility
             render_styled_dataframe(display_df, max_height="350px")
             
             # Download button
-            csv_data = summary_df.to_csv(index=False)
+            csv_data = to_csv_bytes(summary_df)
             st.download_button(
                 label="Unduh Ringkasan Komoditas (CSV)",
                 data=csv_data,
@@ -286,5 +279,3 @@ def main():
 
 if __name__ == "__main__":
     main()
-else:
-    main()
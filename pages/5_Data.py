@@ -17,7 +17,12 @@ from src.constants import (
     COL_COMMODITY,
     COL_REGION,
     COL_PRICE,
+    CANONICAL_COLUMNS,
+    METRICS_CACHE_MAX_ENTRIES,
 )
+from src.charts import format_values
+from src.io import EXPORT_FORMATS
+from src.data_loader import Filters, select_rows, load_and_process_data, FRAME_HASH_FUNCS
 from src.theme import apply_theme, render_styled_dataframe
 
 # =============================================================================
@@ -59,15 +64,26 @@ def format_currency(value):
         return str(value)
 
 
-def get_data_quality_stats(df):
-    """Calculate data quality statistics."""
+@st.cache_data(max_entries=METRICS_CACHE_MAX_ENTRIES, show_spinner=False, hash_funcs=FRAME_HASH_FUNCS)
+def get_data_quality_stats(df, commodity=None, regions=None, date_range=None):
+    """
+    Calculate data quality statistics for the filtered canonical rows.
+    
+    Memoized per dataset and filter combination: pass the loader's frame
+    (keyed by its fingerprint) with the filters rather than a filtered copy.
+    """
     try:
-        if df is None or df.empty:
+        df = select_rows(df, commodity, regions, date_range)[CANONICAL_COLUMNS]
+        
+        if df.empty:
             return {}
         
         total_rows = len(df)
-        missing_values = df.isnull().sum().sum()
-        missing_pct = (missing_values / (total_rows * len(df.columns))) * 100 if total_rows > 0 else 0
+        
+        # One reduction over a single bool buffer instead of per-column sums
+        is_missing = df.isna().to_numpy()
+        missing_values = int(is_missing.sum())
+        missing_pct = (missing_values / is_missing.size) * 100 if is_missing.size else 0
         
         # Date range
         date_min = df[COL_DATE].min() if COL_DATE in df.columns else None
@@ -77,10 +93,8 @@ def get_data_quality_stats(df):
         n_commodities = df[COL_COMMODITY].nunique() if COL_COMMODITY in df.columns else 0
         n_regions = df[COL_REGION].nunique() if COL_REGION in df.columns else 0
         
-        # Price statistics
-        price_min = df[COL_PRICE].min() if COL_PRICE in df.columns else 0
-        price_max = df[COL_PRICE].max() if COL_PRICE in df.columns else 0
-        price_mean = df[COL_PRICE].mean() if COL_PRICE in df.columns else 0
+        # Price statistics (one aggregation call)
+        price_min, price_max, price_mean = df[COL_PRICE].agg(['min', 'max', 'mean'])
         
         return {
             'total_rows': total_rows,
@@ -99,6 +113,38 @@ def get_data_quality_stats(df):
         return {}
 
 
+@st.cache_data(max_entries=METRICS_CACHE_MAX_ENTRIES, show_spinner=False, hash_funcs=FRAME_HASH_FUNCS)
+def get_export_bytes(df, file_format="CSV", commodity=None, regions=None, date_range=None) -> bytes:
+    """
+    File contents of the filtered canonical rows for the download buttons.
+    
+    Memoized like get_data_quality_stats (pass the loader's frame and the
+    filters), so repeated downloads of the same selection reuse the bytes.
+    file_format is a key of EXPORT_FORMATS.
+    """
+    serialize = EXPORT_FORMATS[file_format][2]
+    return serialize(select_rows(df, commodity, regions, date_range)[CANONICAL_COLUMNS])
+
+
+@st.cache_data(show_spinner=False, hash_funcs=FRAME_HASH_FUNCS)
+def get_column_info(df) -> pd.DataFrame:
+    """
+    Dtype and null counts per canonical column of the loader's frame.
+    
+    Null counts come from one notna pass over the whole frame; the result
+    is memoized per dataset, since the table never changes between reruns.
+    """
+    df = df[CANONICAL_COLUMNS]
+    non_null = df.notna().sum().to_numpy()
+    
+    return pd.DataFrame({
+        'Kolom': df.columns.tolist(),
+        'Tipe': df.dtypes.astype(str).tolist(),
+        'Jumlah Non-Null': non_null,
+        'Jumlah Null': len(df) - non_null,
+    })
+
+
 # =============================================================================
 # MAIN PAGE
 # =============================================================================
@@ -108,12 +154,13 @@ def main():
     st.markdown("Lihat, filter, dan ekspor data dengan statistik kualitas.")
     
     # Check if data is loaded
-    if 'df' not in st.session_state:
+    if 'data_path' not in st.session_state:
         st.warning("Data belum dimuat. Silakan kembali ke Beranda untuk memuat data.")
         st.stop()
     
-    df = st.session_state['df']
-    filters = st.session_state.get('filters', {})
+    # Shared cached object (same one Home loaded), no session copy
+    df, _, data_stats = load_and_process_data(st.session_state['data_path'])
+    filters = st.session_state.get('filters') or Filters()
     
     # Validate data
     if df is None or df.empty:
@@ -121,38 +168,31 @@ def main():
         st.stop()
     
     # Get filter values with safe defaults
-    commodity = filters.get('commodity')
-    if commodity is None:
-        commodity = df[COL_COMMODITY].iloc[0] if not df.empty else None
+    commodity = filters.commodity
+    regions = filters.regions or None
+    
+    date_range = filters.date_range
+    
+    # Memoized per filter combination on the loader's frame, which is keyed
+    # by its fingerprint (the canonical projection below would be hashed)
+    quality_stats = get_data_quality_stats(df, commodity, regions, date_range)
     
-    regions = filters.get('regions', [])
-    if not regions:
-        regions = [df[COL_REGION].iloc[0]] if not df.empty else []
+    # Kept for the memoized exports, which take the same arguments
+    source_df = df
     
-    date_start = filters.get('date_start')
-    date_end = filters.get('date_end')
+    # Only the canonical columns are shown and exported (the loader also
+    # carries precomputed moving averages and daily changes)
+    df = df[CANONICAL_COLUMNS]
     
-    # Filter data
-    df_filtered = df.copy()
+    # Filter data (masking returns a new frame; the shared df is never modified)
+    df_filtered = df
     
     try:
-        # Apply commodity filter
-        if commodity:
-            df_filtered = df_filtered[df_filtered[COL_COMMODITY] == commodity]
-        
-        # Apply region filter
-        if regions:
-            df_filtered = df_filtered[df_filtered[COL_REGION].isin(regions)]
-        
-        # Apply date filter
-        if date_start and date_end:
-            df_filtered = df_filtered[
-                (df_filtered[COL_DATE] >= pd.Timestamp(date_start)) &
-                (df_filtered[COL_DATE] <= pd.Timestamp(date_end))
-            ]
+        # Apply commodity, region and date filters in one pass
+        df_filtered = select_rows(df_filtered, commodity, regions, date_range)
     except Exception as e:
         st.warning(f"Kesalahan menerapkan filter: {str(e)}")
-        df_filtered = df.copy()
+        df_filtered = df
     
     # ==========================================================================
     # STATISTIK KUALITAS DATA
@@ -162,8 +202,6 @@ def main():
     st.markdown("### Statistik Kualitas Data")
     
     try:
-        quality_stats = get_data_quality_stats(df_filtered)
-        
         if quality_stats:
             col1, col2, col3, col4 = st.columns(4)
             
@@ -207,25 +245,27 @@ def main():
     st.markdown("### Statistik Harga")
     
     try:
-        if not df_filtered.empty and COL_PRICE in df_filtered.columns:
+        # Same rows as df_filtered: the memoized stats already hold the
+        # min/mean/max from one aggregation, so the column is not rescanned
+        if quality_stats:
             col1, col2, col3 = st.columns(3)
             
             with col1:
                 st.metric(
                     label="Harga Minimum",
-                    value=format_currency(df_filtered[COL_PRICE].min())
+                    value=format_currency(quality_stats['price_min'])
                 )
             
             with col2:
                 st.metric(
                     label="Harga Rata-rata",
-                    value=format_currency(df_filtered[COL_PRICE].mean())
+                    value=format_currency(quality_stats['price_mean'])
                 )
             
             with col3:
                 st.metric(
                     label="Harga Maksimum",
-                    value=format_currency(df_filtered[COL_PRICE].max())
+                    value=format_currency(quality_stats['price_max'])
                 )
     except Exception as e:
         st.warning(f"Tidak dapat menghitung statistik harga: {str(e)}")
@@ -251,27 +291,29 @@ def main():
         )
     
     try:
-        display_df = df.copy() if show_all else df_filtered.copy()
+        display_df = df if show_all else df_filtered
         
         if not display_df.empty:
-            # Sort by date descending
-            if COL_DATE in display_df.columns:
-                display_df = display_df.sort_values(COL_DATE, ascending=False)
-            
-            # Limit rows
             total_rows = len(display_df)
-            display_df = display_df.head(max_rows)
             
-            # Format for display
+            # Newest first: only the date column is sorted and only the
+            # shown rows are taken, so the full frame is never reordered
+            if COL_DATE in display_df.columns:
+                newest = display_df[COL_DATE].sort_values(ascending=False).index[:max_rows]
+                display_df = display_df.loc[newest]
+            else:
+                display_df = display_df.head(max_rows)
+            
+            # Format for display (a copy of at most max_rows rows)
             display_formatted = display_df.copy()
             
             # Format date column
             if COL_DATE in display_formatted.columns:
                 display_formatted[COL_DATE] = display_formatted[COL_DATE].dt.strftime('%Y-%m-%d')
             
-            # Format price column
+            # Format price column (same text as format_currency, one call per distinct price)
             if COL_PRICE in display_formatted.columns:
-                display_formatted[COL_PRICE] = display_formatted[COL_PRICE].apply(format_currency)
+                display_formatted[COL_PRICE] = format_values(display_formatted[COL_PRICE], "Rp {:,.0f}")
             
             # Show info about displayed rows
             if total_rows > max_rows:
@@ -291,37 +333,45 @@ def main():
     st.markdown("---")
     st.markdown("### Ekspor Data")
     
+    # Parquet is offered only when pyarrow is installed
+    if len(EXPORT_FORMATS) > 1:
+        export_format = st.radio("Format ekspor", list(EXPORT_FORMATS), horizontal=True)
+    else:
+        export_format = "CSV"
+    extension, mime, _ = EXPORT_FORMATS[export_format]
+    timestamp = datetime.now().strftime('%Y%m%d_%H%M%S')
+    
     col1, col2 = st.columns(2)
     
+    # The file is only built when a button is clicked (download_button runs
+    # the callable then), not on every rerun of the page
     try:
         with col1:
             # Export filtered data
             if not df_filtered.empty:
-                csv_filtered = df_filtered.to_csv(index=False)
                 st.download_button(
-                    label="Unduh Data Terfilter (CSV)",
-                    data=csv_filtered,
-                    file_name=f"data_terfilter_{datetime.now().strftime('%Y%m%d_%H%M%S')}.csv",
-                    mime="text/csv",
-                    help="Unduh data yang sudah difilter sebagai CSV"
+                    label=f"Unduh Data Terfilter ({export_format})",
+                    data=lambda: get_export_bytes(source_df, export_format, commodity, regions, date_range),
+                    file_name=f"data_terfilter_{timestamp}.{extension}",
+                    mime=mime,
+                    help=f"Unduh data yang sudah difilter sebagai {export_format}"
                 )
             else:
-                st.button("Unduh Data Terfilter (CSV)", disabled=True)
+                st.button(f"Unduh Data Terfilter ({export_format})", disabled=True)
                 st.caption("Tidak ada data terfilter tersedia")
         
         with col2:
             # Export all data
             if not df.empty:
-                csv_all = df.to_csv(index=False)
                 st.download_button(
-                    label="Unduh Semua Data (CSV)",
-                    data=csv_all,
-                    file_name=f"semua_data_{datetime.now().strftime('%Y%m%d_%H%M%S')}.csv",
-                    mime="text/csv",
-                    help="Unduh seluruh dataset sebagai CSV"
+                    label=f"Unduh Semua Data ({export_format})",
+                    data=lambda: get_export_bytes(source_df, export_format),
+                    file_name=f"semua_data_{timestamp}.{extension}",
+                    mime=mime,
+                    help=f"Unduh seluruh dataset sebagai {export_format}"
                 )
             else:
-                st.button("Unduh Semua Data (CSV)", disabled=True)
+                st.button(f"Unduh Semua Data ({export_format})", disabled=True)
                 st.caption("Tidak ada data tersedia")
     except Exception as e:
         st.warning(f"Kesalahan menyiapkan ekspor: {str(e)}")
@@ -333,33 +383,28 @@ def main():
     st.markdown("---")
     st.markdown("### Metadata Dataset")
     
+    # Each expander's content is only built while it is open (on_change=
+    # "rerun" makes .open track its state), as on the other pages
     try:
-        # List all commodities
-        if COL_COMMODITY in df.columns:
-            with st.expander("Komoditas Tersedia", expanded=False):
-                commodities = sorted(df[COL_COMMODITY].unique().tolist())
-                st.write(", ".join(commodities))
+        # The loader already collected the sorted commodity and region lists
+        commodities_panel = st.expander("Komoditas Tersedia", expanded=False, key="data_commodities_expander", on_change="rerun")
+        with commodities_panel:
+            if commodities_panel.open:
+                st.write(", ".join(data_stats['commodities']))
         
-        # List all regions
-        if COL_REGION in df.columns:
-            with st.expander("Wilayah Tersedia", expanded=False):
-                region_list = sorted(df[COL_REGION].unique().tolist())
-                st.write(", ".join(region_list))
+        regions_panel = st.expander("Wilayah Tersedia", expanded=False, key="data_regions_expander", on_change="rerun")
+        with regions_panel:
+            if regions_panel.open:
+                st.write(", ".join(data_stats['regions']))
         
         # Column information
-        with st.expander("Informasi Kolom", expanded=False):
-            col_info = pd.DataFrame({
-                'Kolom': df.columns.tolist(),
-                'Tipe': [str(dtype) for dtype in df.dtypes.tolist()],
-                'Jumlah Non-Null': [df[col].notna().sum() for col in df.columns],
-                'Jumlah Null': [df[col].isna().sum() for col in df.columns]
-            })
-            render_styled_dataframe(col_info, max_height="250px")
+        columns_panel = st.expander("Informasi Kolom", expanded=False, key="data_columns_expander", on_change="rerun")
+        with columns_panel:
+            if columns_panel.open:
+                render_styled_dataframe(get_column_info(source_df), max_height="250px")
     except Exception as e:
         st.warning(f"Tidak dapat menampilkan metadata: {str(e)}")
 
 
 if __name__ == "__main__":
     main()
-else:
-    main()
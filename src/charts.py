@@ -6,59 +6,143 @@ Uses consistent styling defined in constants.
 Supports dark/light theme switching.
 """
 
+import functools
 import pandas as pd
 import numpy as np
-import plotly.express as px
 import plotly.graph_objects as go
 from plotly.subplots import make_subplots
-from typing import List, Optional, Dict, Tuple
+from typing import List, Dict, Tuple
 from datetime import datetime
 import streamlit as st
 
 from .constants import (
     COL_DATE,
-    COL_COMMODITY,
     COL_REGION,
     COL_PRICE,
+    COL_MA7,
+    COL_MA14,
+    COL_DAILY_CHANGE,
     CHART_COLORS,
     CHART_LAYOUT,
     LABELS,
     KPI_POSITIVE_COLOR,
     KPI_NEGATIVE_COLOR,
     KPI_NEUTRAL_COLOR,
+    CHART_CACHE_MAX_ENTRIES,
+    WEBGL_MIN_POINTS,
 )
+from .data_loader import select_rows, slice_dates, FRAME_HASH_FUNCS
+from .preprocess import rolling_mean
+
+
+def _cached_figure(func):
+    """
+    Memoize a figure factory on its inputs and the active theme.
+    
+    Figures are rebuilt only when the data, the filters or the theme
+    change. Each call returns an unpickled copy, so callers may still
+    update the figure.
+    """
+    @functools.wraps(func)
+    def build(*args, theme_mode: str, **kwargs):
+        # theme_mode only keys the cache; the figure reads it via get_chart_colors
+        return func(*args, **kwargs)
+    
+    cached = st.cache_data(
+        max_entries=CHART_CACHE_MAX_ENTRIES,
+        show_spinner=False,
+        hash_funcs=FRAME_HASH_FUNCS,
+    )(build)
+    
+    @functools.wraps(func)
+    def wrapper(*args, **kwargs):
+        return cached(*args, theme_mode=st.session_state.get('theme_mode', 'light'), **kwargs)
+    
+    return wrapper
+
+
+# Theme colors for charts with high contrast, keyed by is_dark
+_CHART_THEME_COLORS = {
+    True: {
+        'paper_bgcolor': '#0E1117',
+        'plot_bgcolor': '#1A1A2E',
+        'font_color': '#FFFFFF',
+        'grid_color': 'rgba(255,255,255,0.12)',
+        'line_color': 'rgba(255,255,255,0.25)',
+        'title_color': '#FFFFFF',
+        'axis_color': '#E0E0E0',  # Brighter for better readability
+        'axis_title_color': '#FFFFFF',  # Full white for axis titles
+        'hover_bgcolor': '#2D2D3D',
+        'tick_color': '#D0D0D0',  # High contrast tick labels
+    },
+    False: {
+        'paper_bgcolor': '#FFFFFF',
+        'plot_bgcolor': '#FAFAFA',
+        'font_color': '#1A1A1A',
+        'grid_color': 'rgba(0,0,0,0.08)',
+        'line_color': 'rgba(0,0,0,0.15)',
+        'title_color': '#1E3A5F',
+        'axis_color': '#333333',  # Darker for better readability
+        'axis_title_color': '#1E3A5F',  # Match title color
+        'hover_bgcolor': '#FFFFFF',
+        'tick_color': '#444444',  # High contrast tick labels
+    },
+}
 
 
 def get_chart_colors():
-    """Get theme-aware colors for charts with high contrast."""
-    is_dark = st.session_state.get('theme_mode', 'light') == 'dark'
+    """Get theme-aware colors for charts with high contrast (read-only)."""
+    return _CHART_THEME_COLORS[st.session_state.get('theme_mode', 'light') == 'dark']
+
+
+def _build_layout_style(colors: Dict[str, str]) -> Dict[str, dict]:
+    """
+    Build the title-independent layout and axis styling for one theme.
     
-    if is_dark:
-        return {
-            'paper_bgcolor': '#0E1117',
-            'plot_bgcolor': '#1A1A2E',
-            'font_color': '#FFFFFF',
-            'grid_color': 'rgba(255,255,255,0.12)',
-            'line_color': 'rgba(255,255,255,0.25)',
-            'title_color': '#FFFFFF',
-            'axis_color': '#E0E0E0',  # Brighter for better readability
-            'axis_title_color': '#FFFFFF',  # Full white for axis titles
-            'hover_bgcolor': '#2D2D3D',
-            'tick_color': '#D0D0D0',  # High contrast tick labels
-        }
-    else:
-        return {
-            'paper_bgcolor': '#FFFFFF',
-            'plot_bgcolor': '#FAFAFA',
-            'font_color': '#1A1A1A',
-            'grid_color': 'rgba(0,0,0,0.08)',
-            'line_color': 'rgba(0,0,0,0.15)',
-            'title_color': '#1E3A5F',
-            'axis_color': '#333333',  # Darker for better readability
-            'axis_title_color': '#1E3A5F',  # Match title color
-            'hover_bgcolor': '#FFFFFF',
-            'tick_color': '#444444',  # High contrast tick labels
-        }
+    Args:
+        colors: Theme colors from _CHART_THEME_COLORS.
+        
+    Returns:
+        Dict with 'layout', 'xaxes' and 'yaxes' keyword arguments.
+    """
+    axis = dict(
+        showgrid=True,
+        gridwidth=1,
+        gridcolor=colors['grid_color'],
+        showline=True,
+        linewidth=1,
+        linecolor=colors['line_color'],
+        tickfont=dict(color=colors['tick_color'], size=12),
+        title_font=dict(color=colors['axis_title_color'], size=13),
+    )
+    
+    return {
+        'layout': dict(
+            font=dict(
+                family=CHART_LAYOUT["font_family"],
+                color=colors['font_color']
+            ),
+            legend=dict(
+                font=dict(size=CHART_LAYOUT["legend_font_size"], color=colors['font_color']),
+                bgcolor='rgba(0,0,0,0)',
+            ),
+            margin=CHART_LAYOUT["margin"],
+            height=CHART_LAYOUT["height"],
+            paper_bgcolor=colors['paper_bgcolor'],
+            plot_bgcolor=colors['plot_bgcolor'],
+            hovermode="x unified",
+            hoverlabel=dict(
+                bgcolor=colors['hover_bgcolor'],
+                font_color=colors['font_color'],
+            ),
+        ),
+        'xaxes': axis,
+        'yaxes': dict(axis, tickformat=","),
+    }
+
+
+# Only two themes; build their styling once per process
+_LAYOUT_STYLES = {is_dark: _build_layout_style(colors) for is_dark, colors in _CHART_THEME_COLORS.items()}
 
 
 def apply_default_layout(fig: go.Figure, title: str = None) -> go.Figure:
@@ -73,57 +157,44 @@ def apply_default_layout(fig: go.Figure, title: str = None) -> go.Figure:
         Styled figure.
     """
     colors = get_chart_colors()
+    style = _LAYOUT_STYLES[st.session_state.get('theme_mode', 'light') == 'dark']
     
     fig.update_layout(
         title=dict(
             text=title,
             font=dict(color=colors['title_color'], size=CHART_LAYOUT["title_font_size"])
         ) if title else None,
-        font=dict(
-            family=CHART_LAYOUT["font_family"],
-            color=colors['font_color']
-        ),
-        legend=dict(
-            font=dict(size=CHART_LAYOUT["legend_font_size"], color=colors['font_color']),
-            bgcolor='rgba(0,0,0,0)',
-        ),
-        margin=CHART_LAYOUT["margin"],
-        height=CHART_LAYOUT["height"],
-        paper_bgcolor=colors['paper_bgcolor'],
-        plot_bgcolor=colors['plot_bgcolor'],
-        hovermode="x unified",
-        hoverlabel=dict(
-            bgcolor=colors['hover_bgcolor'],
-            font_color=colors['font_color'],
-        ),
+        **style['layout'],
     )
+    fig.update_xaxes(**style['xaxes'])
+    fig.update_yaxes(**style['yaxes'])
     
-    fig.update_xaxes(
-        showgrid=True,
-        gridwidth=1,
-        gridcolor=colors['grid_color'],
-        showline=True,
-        linewidth=1,
-        linecolor=colors['line_color'],
-        tickfont=dict(color=colors['tick_color'], size=12),
-        title_font=dict(color=colors['axis_title_color'], size=13),
-    )
+    return fig
+
+
+def _trace_rows(data: pd.DataFrame) -> pd.DataFrame:
+    """
+    Rows in date order for one line trace.
     
-    fig.update_yaxes(
-        showgrid=True,
-        gridwidth=1,
-        gridcolor=colors['grid_color'],
-        showline=True,
-        linewidth=1,
-        linecolor=colors['line_color'],
-        tickformat=",",
-        tickfont=dict(color=colors['tick_color'], size=12),
-        title_font=dict(color=colors['axis_title_color'], size=13),
-    )
+    Slices of one (commodity, region) group of the group-sorted frame are
+    already in date order, so they are not re-sorted.
+    """
+    if data[COL_DATE].is_monotonic_increasing:
+        return data
+    return data.sort_values(COL_DATE)
+
+
+def _line_trace_type(n_points: int) -> type:
+    """
+    Trace class for a line chart holding n_points points in total.
     
-    return fig
+    Multi-year selections switch to WebGL, which the browser draws far
+    faster than thousands of SVG path points.
+    """
+    return go.Scattergl if n_points >= WEBGL_MIN_POINTS else go.Scatter
 
 
+@_cached_figure
 def create_price_trend_chart(
     df: pd.DataFrame,
     commodity: str,
@@ -148,27 +219,30 @@ def create_price_trend_chart(
     """
     fig = go.Figure()
     
-    mask = df[COL_COMMODITY] == commodity
-    data = df[mask].dropna(subset=[COL_PRICE])
+    data = select_rows(df, commodity, regions, date_range)
     
-    if date_range:
-        data = data[
-            (data[COL_DATE] >= pd.Timestamp(date_range[0])) &
-            (data[COL_DATE] <= pd.Timestamp(date_range[1]))
-        ]
+    # One pass splits the selection by region instead of re-masking it
+    # for every region
+    by_region = dict(list(data.groupby(COL_REGION, observed=True, sort=False)))
+    
+    line_trace = _line_trace_type(len(data) * (1 + show_ma7 + show_ma14))
     
     for i, region in enumerate(regions):
-        region_data = data[data[COL_REGION] == region].sort_values(COL_DATE)
+        region_data = _trace_rows(by_region.get(region, data.iloc[0:0]))
         
         if region_data.empty:
             continue
         
         color = CHART_COLORS[i % len(CHART_COLORS)]
         
+        # Plain ndarrays skip Plotly's per-element pandas conversion and
+        # serialize far faster; the dates are shared by all three traces
+        dates = region_data[COL_DATE].to_numpy()
+        
         # Main price line
-        fig.add_trace(go.Scatter(
-            x=region_data[COL_DATE],
-            y=region_data[COL_PRICE],
+        fig.add_trace(line_trace(
+            x=dates,
+            y=region_data[COL_PRICE].to_numpy(),
             mode='lines',
             name=region,
             line=dict(color=color, width=2),
@@ -177,11 +251,15 @@ def create_price_trend_chart(
                          "Price: Rp %{y:,.0f}<extra></extra>"
         ))
         
-        # Moving averages
+        # Moving averages: the loader precomputes them over each full
+        # series; frames without them fall back to the cumsum kernel
         if show_ma7 and len(region_data) >= 7:
-            ma7 = region_data[COL_PRICE].rolling(7).mean()
-            fig.add_trace(go.Scatter(
-                x=region_data[COL_DATE],
+            if COL_MA7 in region_data:
+                ma7 = region_data[COL_MA7].to_numpy()
+            else:
+                ma7 = rolling_mean(region_data[COL_PRICE].to_numpy(), 7)
+            fig.add_trace(line_trace(
+                x=dates,
                 y=ma7,
                 mode='lines',
                 name=f'{region} MA7',
@@ -192,9 +270,12 @@ def create_price_trend_chart(
             ))
         
         if show_ma14 and len(region_data) >= 14:
-            ma14 = region_data[COL_PRICE].rolling(14).mean()
-            fig.add_trace(go.Scatter(
-                x=region_data[COL_DATE],
+            if COL_MA14 in region_data:
+                ma14 = region_data[COL_MA14].to_numpy()
+            else:
+                ma14 = rolling_mean(region_data[COL_PRICE].to_numpy(), 14)
+            fig.add_trace(line_trace(
+                x=dates,
                 y=ma14,
                 mode='lines',
                 name=f'{region} MA14',
@@ -219,6 +300,71 @@ def create_price_trend_chart(
     return apply_default_layout(fig, f"Tren Harga: {commodity}")
 
 
+# Static Vega-Lite spec for the plain price trend; only the data and the
+# theme colors change between reruns
+_PRICE_TREND_SPEC = {
+    "mark": {"type": "line", "strokeWidth": 2},
+    "encoding": {
+        "x": {"field": COL_DATE, "type": "temporal", "title": "Tanggal"},
+        "y": {
+            "field": COL_PRICE,
+            "type": "quantitative",
+            "title": LABELS["price_unit"],
+            "axis": {"format": ","},
+        },
+        "color": {
+            "field": COL_REGION,
+            "type": "nominal",
+            "title": None,
+            "legend": {"orient": "top"},
+        },
+        "tooltip": [
+            {"field": COL_REGION, "type": "nominal", "title": "Wilayah"},
+            {"field": COL_DATE, "type": "temporal", "title": "Tanggal", "format": "%d %b %Y"},
+            {"field": COL_PRICE, "type": "quantitative", "title": "Harga", "format": ",.0f"},
+        ],
+    },
+}
+
+
+def render_price_trend(df_slice: pd.DataFrame, regions: List[str]) -> None:
+    """
+    Render a plain price trend (no moving averages) with st.vega_lite_chart.
+    
+    Much lighter than building and shipping a Plotly figure; use
+    create_price_trend_chart when the MA overlays are needed.
+    
+    Args:
+        df_slice: Rows of one commodity for the selected regions/dates.
+        regions: Regions in display order (sets the line colors).
+    """
+    colors = get_chart_colors()
+    
+    spec = dict(_PRICE_TREND_SPEC)
+    spec["encoding"] = dict(spec["encoding"])
+    spec["encoding"]["color"] = {
+        **spec["encoding"]["color"],
+        "scale": {"domain": list(regions), "range": list(CHART_COLORS)},
+    }
+    spec["height"] = CHART_LAYOUT["height"]
+    spec["background"] = colors['paper_bgcolor']
+    spec["config"] = {
+        "font": CHART_LAYOUT["font_family"],
+        "view": {"fill": colors['plot_bgcolor'], "stroke": None},
+        "axis": {
+            "gridColor": colors['grid_color'],
+            "domainColor": colors['line_color'],
+            "labelColor": colors['tick_color'],
+            "titleColor": colors['axis_title_color'],
+        },
+        "legend": {"labelColor": colors['font_color']},
+    }
+    
+    data = df_slice[[COL_DATE, COL_REGION, COL_PRICE]]
+    st.vega_lite_chart(data, spec, width="stretch", theme=None)
+
+
+@_cached_figure
 def create_price_trend_with_anomalies(
     df: pd.DataFrame,
     anomalies: pd.DataFrame,
@@ -241,21 +387,17 @@ def create_price_trend_with_anomalies(
     """
     fig = go.Figure()
     
-    data = anomalies.copy()
-    
-    if date_range:
-        data = data[
-            (data[COL_DATE] >= pd.Timestamp(date_range[0])) &
-            (data[COL_DATE] <= pd.Timestamp(date_range[1]))
-        ]
+    # The anomaly frame is one series in date order: slice by binary search
+    # (read only, so no copy is taken)
+    data = slice_dates(anomalies, date_range)
     
     if data.empty:
         return fig
     
     # Main price line
     fig.add_trace(go.Scatter(
-        x=data[COL_DATE],
-        y=data[COL_PRICE],
+        x=data[COL_DATE].to_numpy(),
+        y=data[COL_PRICE].to_numpy(),
         mode='lines',
         name='Price',
         line=dict(color=CHART_COLORS[0], width=2),
@@ -265,8 +407,8 @@ def create_price_trend_with_anomalies(
     anomaly_points = data[data['is_anomaly'] == True]
     if not anomaly_points.empty:
         fig.add_trace(go.Scatter(
-            x=anomaly_points[COL_DATE],
-            y=anomaly_points[COL_PRICE],
+            x=anomaly_points[COL_DATE].to_numpy(),
+            y=anomaly_points[COL_PRICE].to_numpy(),
             mode='markers',
             name='Anomaly',
             marker=dict(
@@ -279,7 +421,7 @@ def create_price_trend_with_anomalies(
                          "Date: %{x|%d %b %Y}<br>" +
                          "Price: Rp %{y:,.0f}<br>" +
                          f"Change: %{{customdata:.1f}}%<extra></extra>",
-            customdata=anomaly_points['daily_change_pct']
+            customdata=anomaly_points[COL_DAILY_CHANGE].to_numpy()
         ))
     
     fig.update_layout(
@@ -290,6 +432,7 @@ def create_price_trend_with_anomalies(
     return apply_default_layout(fig, f"Anomali Harga: {commodity} - {region}")
 
 
+@_cached_figure
 def create_top_movers_bar(
     gainers: pd.DataFrame,
     losers: pd.DataFrame,
@@ -319,13 +462,13 @@ def create_top_movers_bar(
     # Top gainers - bright green
     if not gainers.empty:
         fig.add_trace(go.Bar(
-            y=gainers[COL_REGION],
-            x=gainers['change_pct'],
+            y=gainers[COL_REGION].to_numpy(),
+            x=gainers['change_pct'].to_numpy(),
             orientation='h',
             marker_color="#16A34A",
             marker_line_color="#166534",
             marker_line_width=2,
-            text=gainers['change_pct'].apply(lambda x: f"+{x:.1f}%"),
+            text=format_values(gainers['change_pct'], "+{:.1f}%").to_numpy(),
             textposition='outside',
             textfont=dict(color=bar_text_color, size=12, family="Arial Black"),
             hovertemplate="<b>%{y}</b><br>Perubahan: +%{x:.1f}%<extra></extra>",
@@ -335,13 +478,13 @@ def create_top_movers_bar(
     # Top losers - bright red
     if not losers.empty:
         fig.add_trace(go.Bar(
-            y=losers[COL_REGION],
-            x=losers['change_pct'],
+            y=losers[COL_REGION].to_numpy(),
+            x=losers['change_pct'].to_numpy(),
             orientation='h',
             marker_color="#DC2626",
             marker_line_color="#991B1B",
             marker_line_width=2,
-            text=losers['change_pct'].apply(lambda x: f"{x:.1f}%"),
+            text=format_values(losers['change_pct'], "{:.1f}%").to_numpy(),
             textposition='outside',
             textfont=dict(color=bar_text_color, size=12, family="Arial Black"),
             hovertemplate="<b>%{y}</b><br>Perubahan: %{x:.1f}%<extra></extra>",
@@ -363,6 +506,7 @@ def create_top_movers_bar(
     return apply_default_layout(fig)
 
 
+@_cached_figure
 def create_regional_ranking_bar(
     highest: pd.DataFrame,
     lowest: pd.DataFrame,
@@ -396,13 +540,13 @@ def create_regional_ranking_bar(
     # Highest prices
     if not highest.empty:
         fig.add_trace(go.Bar(
-            y=highest[COL_REGION],
-            x=highest[COL_PRICE],
+            y=highest[COL_REGION].to_numpy(),
+            x=highest[COL_PRICE].to_numpy(),
             orientation='h',
             marker_color=bar_color_high,
             marker_line_color="#1E40AF",
             marker_line_width=2,
-            text=highest[COL_PRICE].apply(lambda x: f"Rp {x:,.0f}"),
+            text=format_values(highest[COL_PRICE], "Rp {:,.0f}").to_numpy(),
             textposition='outside',
             textfont=dict(color=bar_text_color, size=12, family="Arial Black"),
             hovertemplate="<b>%{y}</b><br>Harga: Rp %{x:,.0f}<extra></extra>",
@@ -412,13 +556,13 @@ def create_regional_ranking_bar(
     # Lowest prices
     if not lowest.empty:
         fig.add_trace(go.Bar(
-            y=lowest[COL_REGION],
-            x=lowest[COL_PRICE],
+            y=lowest[COL_REGION].to_numpy(),
+            x=lowest[COL_PRICE].to_numpy(),
             orientation='h',
             marker_color=bar_color_low,
             marker_line_color="#166534",
             marker_line_width=2,
-            text=lowest[COL_PRICE].apply(lambda x: f"Rp {x:,.0f}"),
+            text=format_values(lowest[COL_PRICE], "Rp {:,.0f}").to_numpy(),
             textposition='outside',
             textfont=dict(color=bar_text_color, size=12, family="Arial Black"),
             hovertemplate="<b>%{y}</b><br>Harga: Rp %{x:,.0f}<extra></extra>",
@@ -440,6 +584,7 @@ def create_regional_ranking_bar(
     return apply_default_layout(fig)
 
 
+@_cached_figure
 def create_volatility_scatter(
     data: pd.DataFrame,
 ) -> go.Figure:
@@ -455,32 +600,34 @@ def create_volatility_scatter(
     if data.empty:
         return go.Figure()
     
-    fig = px.scatter(
-        data,
-        x='avg_price',
-        y='volatility',
-        text=COL_REGION,
-        color='volatility',
-        color_continuous_scale='RdYlGn_r',
-    )
-    
-    fig.update_traces(
+    # One trace, so it is built directly rather than through plotly.express
+    fig = go.Figure(go.Scatter(
+        x=data['avg_price'].to_numpy(),
+        y=data['volatility'].to_numpy(),
+        text=data[COL_REGION].to_numpy(),
+        mode='markers+text',
         textposition='top center',
-        marker=dict(size=12),
+        marker=dict(
+            size=12,
+            color=data['volatility'].to_numpy(),
+            coloraxis='coloraxis',
+        ),
         hovertemplate="<b>%{text}</b><br>" +
                      "Average Price: Rp %{x:,.0f}<br>" +
                      "Volatility: %{y:.2f}%<extra></extra>"
-    )
+    ))
     
     fig.update_layout(
         xaxis_title="Average Price (Rp)",
         yaxis_title="Volatility (%)",
+        coloraxis_colorscale='RdYlGn_r',
         coloraxis_colorbar_title="Volatility",
     )
     
     return apply_default_layout(fig, LABELS["price_vs_volatility"])
 
 
+@_cached_figure
 def create_multi_commodity_chart(
     df: pd.DataFrame,
     commodities: List[str],
@@ -501,16 +648,10 @@ def create_multi_commodity_chart(
     """
     fig = go.Figure()
     
-    for i, commodity in enumerate(commodities):
-        mask = (df[COL_COMMODITY] == commodity) & (df[COL_REGION] == region)
-        data = df[mask].dropna(subset=[COL_PRICE]).sort_values(COL_DATE)
-        
-        if date_range:
-            data = data[
-                (data[COL_DATE] >= pd.Timestamp(date_range[0])) &
-                (data[COL_DATE] <= pd.Timestamp(date_range[1]))
-            ]
-        
+    series = [_trace_rows(select_rows(df, commodity, [region], date_range)) for commodity in commodities]
+    line_trace = _line_trace_type(sum(len(data) for data in series))
+    
+    for i, (commodity, data) in enumerate(zip(commodities, series)):
         if data.empty:
             continue
         
@@ -520,9 +661,9 @@ def create_multi_commodity_chart(
         
         color = CHART_COLORS[i % len(CHART_COLORS)]
         
-        fig.add_trace(go.Scatter(
-            x=data[COL_DATE],
-            y=normalized,
+        fig.add_trace(line_trace(
+            x=data[COL_DATE].to_numpy(),
+            y=normalized.to_numpy(),
             mode='lines',
             name=commodity,
             line=dict(color=color, width=2),
@@ -548,11 +689,13 @@ def create_multi_commodity_chart(
     return apply_default_layout(fig, f"Perbandingan Komoditas - {region}")
 
 
+@_cached_figure
 def create_price_heatmap(
     df: pd.DataFrame,
     commodities: List[str],
     region: str,
-    resample: str = 'D'
+    resample: str = 'D',
+    date_range: Tuple[datetime, datetime] = None
 ) -> go.Figure:
     """
     Create heatmap of daily/weekly price changes.
@@ -562,52 +705,45 @@ def create_price_heatmap(
         commodities: List of commodities.
         region: Region name.
         resample: 'D' for daily (needs 1 week), 'W' for weekly (needs 1 month).
+        date_range: Optional date range.
         
     Returns:
         Plotly figure.
     """
-    heatmap_data = []
+    changes = {}
     
     for commodity in commodities:
-        mask = (df[COL_COMMODITY] == commodity) & (df[COL_REGION] == region)
-        data = df[mask].dropna(subset=[COL_PRICE]).copy()
+        data = _trace_rows(select_rows(df, commodity, [region], date_range))
         
         if data.empty:
             continue
         
-        data = data.set_index(COL_DATE).sort_index()
-        
-        if resample == 'D':
-            # Daily: use raw data
-            resampled = data[COL_PRICE]
-        else:
-            # Weekly
-            resampled = data[COL_PRICE].resample(resample).last()
+        prices = data[COL_PRICE].set_axis(data[COL_DATE])
         
-        pct_changes = resampled.pct_change() * 100
+        if resample != 'D':
+            # Weekly (daily uses the raw prices)
+            prices = prices.resample(resample).last()
         
-        for date, change in pct_changes.items():
-            if pd.notna(change):
-                date_str = date.strftime('%m/%d')
-                heatmap_data.append({
-                    'Commodity': commodity,
-                    'Period': date_str,
-                    'Change': change
-                })
-    
-    if not heatmap_data:
-        return go.Figure()
+        # Empty weeks carry the previous price (explicit form of the old
+        # pct_change default, which pandas is deprecating)
+        changes[commodity] = prices.ffill().pct_change(fill_method=None) * 100
     
-    heatmap_df = pd.DataFrame(heatmap_data)
+    # Commodities x periods, aligned on real dates so the columns stay in
+    # calendar order (and unique) across year boundaries
+    pivot = pd.DataFrame(changes, dtype='float64').T.sort_index()
+    pivot = pivot.dropna(axis=0, how='all').dropna(axis=1, how='all')
     
-    # Pivot for heatmap
-    pivot = heatmap_df.pivot(index='Commodity', columns='Period', values='Change')
+    if pivot.empty:
+        return go.Figure()
     
     # Limit columns
     max_cols = 14 if resample == 'D' else 8
     if pivot.shape[1] > max_cols:
         pivot = pivot.iloc[:, -max_cols:]
     
+    # Period labels only for the columns that are shown
+    pivot.columns = pivot.columns.strftime('%m/%d')
+    
     colors = get_chart_colors()
     period_label = "Harian" if resample == 'D' else "Mingguan"
     
@@ -617,8 +753,9 @@ def create_price_heatmap(
         y=pivot.index,
         colorscale='RdYlGn',
         zmid=0,
-        text=np.round(pivot.values, 1),
-        texttemplate="%{text}%",
+        # Labels are formatted from z in the browser, so no separate text
+        # matrix is serialized (at most MAX_COMMODITIES_COMPARE x 14 cells)
+        texttemplate="%{z:.1f}%",
         textfont={"size": 10, "color": colors['font_color']},
         hovertemplate="Komoditas: %{y}<br>" +
                      "Periode: %{x}<br>" +
@@ -637,6 +774,7 @@ def create_price_heatmap(
     return apply_default_layout(fig, f"{LABELS['price_heatmap']} ({period_label})")
 
 
+@_cached_figure
 def create_small_multiples(
     df: pd.DataFrame,
     commodities: List[str],
@@ -673,27 +811,21 @@ def create_small_multiples(
         horizontal_spacing=0.08
     )
     
-    for i, commodity in enumerate(commodities):
+    series = [_trace_rows(select_rows(df, commodity, [region], date_range)) for commodity in commodities]
+    line_trace = _line_trace_type(sum(len(data) for data in series))
+    
+    for i, (commodity, data) in enumerate(zip(commodities, series)):
         row = i // cols + 1
         col = i % cols + 1
         
-        mask = (df[COL_COMMODITY] == commodity) & (df[COL_REGION] == region)
-        data = df[mask].dropna(subset=[COL_PRICE]).sort_values(COL_DATE)
-        
-        if date_range:
-            data = data[
-                (data[COL_DATE] >= pd.Timestamp(date_range[0])) &
-                (data[COL_DATE] <= pd.Timestamp(date_range[1]))
-            ]
-        
         if data.empty:
             continue
         
         color = CHART_COLORS[i % len(CHART_COLORS)]
         
-        fig.add_trace(go.Scatter(
-            x=data[COL_DATE],
-            y=data[COL_PRICE],
+        fig.add_trace(line_trace(
+            x=data[COL_DATE].to_numpy(),
+            y=data[COL_PRICE].to_numpy(),
             mode='lines',
             line=dict(color=color, width=1.5),
             showlegend=False,
@@ -756,3 +888,27 @@ def format_change_value(abs_change: float, pct_change: float) -> Tuple[str, str]
         color = KPI_NEUTRAL_COLOR
     
     return text, color
+
+
+def format_values(values: pd.Series, template: str, missing: str = "-") -> pd.Series:
+    """
+    Format a numeric column for display tables.
+    
+    Each distinct value is formatted once and the strings are gathered
+    back by factorize codes, so repeated prices cost a lookup instead of
+    a Python call per cell.
+    
+    Args:
+        values: Numeric Series.
+        template: str.format template, e.g. "Rp {:,.0f}" or "{:+.1f}%".
+        missing: Text for missing values.
+        
+    Returns:
+        Series of strings with the same index.
+    """
+    codes, uniques = pd.factorize(values.to_numpy())
+    
+    # Code -1 (missing) picks the trailing placeholder
+    labels = np.array([template.format(value) for value in uniques.tolist()] + [missing], dtype=object)
+    
+    return pd.Series(labels[codes], index=values.index, name=values.name)
@@ -19,6 +19,25 @@ COMMODITY_FOLDER = "Harga Bahan Pangan/train"
 GOOGLE_TREND_FOLDER = "Google Trend"
 CURRENCY_FOLDER = "Mata Uang"
 
+# On-disk cache of the processed dataset (relative to project root)
+PROCESSED_CACHE_DIR = ".cache"
+
+# Bump whenever the processed DataFrame layout changes so stale cache files
+# are not reused
+PROCESSED_CACHE_VERSION = 4
+
+# Set this environment variable to "1" to run validate_data on load
+VALIDATE_ENV_VAR = "DASHBOARD_VALIDATE"
+
+# Results kept per cached metric function (one per filter combination)
+METRICS_CACHE_MAX_ENTRIES = 256
+
+# Figures kept per cached chart function (one per filter/theme combination)
+CHART_CACHE_MAX_ENTRIES = 64
+
+# Rows serialized per batch when building CSV downloads
+CSV_EXPORT_CHUNK_ROWS = 50_000
+
 # =============================================================================
 # CANONICAL SCHEMA COLUMN NAMES
 # =============================================================================
@@ -30,6 +49,11 @@ COL_PRICE = "price"
 
 CANONICAL_COLUMNS = [COL_DATE, COL_COMMODITY, COL_REGION, COL_PRICE]
 
+# Derived per-series columns precomputed once by the loader
+COL_MA7 = "ma7"
+COL_MA14 = "ma14"
+COL_DAILY_CHANGE = "daily_change_pct"
+
 # Default region when no regional data is available
 DEFAULT_REGION = "National"
 
@@ -143,8 +167,12 @@ REGIONAL_RANKING_COUNT = 10
 # CHART STYLING
 # =============================================================================
 
+# Line charts holding at least this many points render with WebGL
+# (Scattergl); smaller ones keep crisp SVG lines
+WEBGL_MIN_POINTS = 5_000
+
 # Plotly color palette (accessible, high contrast)
-CHART_COLORS = [
+CHART_COLORS = (
     "#2563EB",  # Bright Blue
     "#EA580C",  # Bright Orange
     "#16A34A",  # Bright Green
@@ -154,7 +182,7 @@ CHART_COLORS = [
     "#DB2777",  # Bright Pink
     "#4B5563",  # Medium Gray
     "#84CC16",  # Lime Green
-]
+)
 
 # Chart layout defaults
 CHART_LAYOUT = {
@@ -177,14 +205,14 @@ KPI_NEUTRAL_COLOR = "#6c757d"   # Gray for neutral/stable
 # DATE PARSING FORMATS
 # =============================================================================
 
-DATE_FORMATS = [
+DATE_FORMATS = (
     "%Y-%m-%d",
     "%d-%m-%Y",
     "%d/%m/%Y",
     "%Y/%m/%d",
     "%d %B %Y",
     "%B %d, %Y",
-]
+)
 
 # =============================================================================
 # FILE PATTERNS
@@ -194,7 +222,7 @@ DATE_FORMATS = [
 DATA_FILE_EXTENSION = ".csv"
 
 # Columns that typically contain dates (case-insensitive matching)
-DATE_COLUMN_PATTERNS = ["date", "tanggal", "periode", "waktu", "time"]
+DATE_COLUMN_PATTERNS = ("date", "tanggal", "periode", "waktu", "time")
 
 # Columns that should not be treated as regions (case-insensitive)
-NON_REGION_COLUMNS = ["date", "tanggal", "periode", "waktu", "time", "commodity", "komoditas", "price", "harga"]
+NON_REGION_COLUMNS = frozenset({"date", "tanggal", "periode", "waktu", "time", "commodity", "komoditas", "price", "harga"})
@@ -0,0 +1,406 @@
+"""
+data_loader.py - Fast access to the processed canonical DataFrame.
+
+Provides:
+- Row masks built from categorical codes instead of string comparisons
+- Binary-search slicing of frames sorted by (commodity, region, date)
+- A cheap dataset fingerprint for st.cache_data keys
+- The cached loader for the processed dataset
+- The Filters record the Home sidebar hands to the pages
+"""
+
+import os
+import hashlib
+import streamlit as st
+import pandas as pd
+import numpy as np
+from dataclasses import dataclass
+from pathlib import Path
+from typing import Iterable, Optional, Tuple
+from datetime import date, datetime
+
+from .constants import (
+    COL_DATE,
+    COL_COMMODITY,
+    COL_REGION,
+    PROCESSED_CACHE_DIR,
+    VALIDATE_ENV_VAR,
+)
+
+# attrs flag set on frames sorted by (commodity, region, date); boolean
+# masks and slices keep both the flag and the row order
+GROUP_SORTED_ATTR = "group_sorted"
+
+# attrs entry identifying the processed dataset (see set_fingerprint)
+FINGERPRINT_ATTR = "fingerprint"
+
+
+@dataclass(frozen=True, slots=True)
+class Filters:
+    """
+    Sidebar selections shared with the pages through st.session_state.
+    
+    Frozen so a page cannot change the selection another page reads;
+    regions is a tuple for the same reason.
+    """
+    commodity: Optional[str] = None
+    regions: Tuple[str, ...] = ()
+    date_start: Optional[date] = None
+    date_end: Optional[date] = None
+    analyst_mode: bool = False
+    
+    @property
+    def date_range(self) -> Optional[Tuple[date, date]]:
+        """(start, end) when both bounds are set, else None."""
+        if self.date_start and self.date_end:
+            return self.date_start, self.date_end
+        return None
+
+
+def _label_mask(series: pd.Series, labels: Iterable[str]) -> np.ndarray:
+    """
+    Boolean mask of rows whose label is one of `labels`.
+    
+    For categoricals the labels are translated to codes once and compared
+    against the integer code array.
+    
+    Args:
+        series: Commodity or region column.
+        labels: Labels to keep.
+        
+    Returns:
+        Boolean ndarray aligned with the series.
+    """
+    labels = list(labels)
+    
+    if isinstance(series.dtype, pd.CategoricalDtype):
+        codes = series.cat.categories.get_indexer(labels)
+        codes = codes[codes >= 0]
+        values = series.cat.codes.to_numpy()
+        if len(codes) == 1:
+            return values == codes[0]
+        return np.isin(values, codes)
+    
+    return series.isin(labels).to_numpy()
+
+
+def _date_bounds(date_range: Tuple[datetime, datetime]) -> Tuple[np.datetime64, np.datetime64]:
+    """Inclusive (start, end) bounds as datetime64[ns] scalars for raw array compares."""
+    return np.datetime64(date_range[0], "ns"), np.datetime64(date_range[1], "ns")
+
+
+def build_mask(
+    df: pd.DataFrame,
+    commodity: Optional[str] = None,
+    regions: Optional[Iterable[str]] = None,
+    date_range: Optional[Tuple[datetime, datetime]] = None
+) -> np.ndarray:
+    """
+    Build a row mask for the usual commodity/region/date filters.
+    
+    Each filter is optional; None means "no restriction".
+    
+    Args:
+        df: Canonical DataFrame.
+        commodity: Commodity name.
+        regions: Region names.
+        date_range: Optional (start, end) date tuple, both inclusive.
+        
+    Returns:
+        Boolean ndarray usable as df[mask].
+    """
+    mask = np.ones(len(df), dtype=bool)
+    
+    if commodity is not None:
+        mask &= _label_mask(df[COL_COMMODITY], [commodity])
+    
+    if regions is not None:
+        mask &= _label_mask(df[COL_REGION], regions)
+    
+    if date_range:
+        start, end = _date_bounds(date_range)
+        dates = df[COL_DATE].to_numpy()
+        mask &= dates >= start
+        mask &= dates <= end
+    
+    return mask
+
+
+def mark_group_sorted(df: pd.DataFrame) -> pd.DataFrame:
+    """
+    Sort by (commodity, region, date) and flag the frame for fast slicing.
+    
+    Args:
+        df: Canonical DataFrame with categorical commodity/region columns.
+        
+    Returns:
+        Sorted DataFrame with a fresh RangeIndex.
+    """
+    df = df.sort_values([COL_COMMODITY, COL_REGION, COL_DATE], kind="stable").reset_index(drop=True)
+    df.attrs[GROUP_SORTED_ATTR] = True
+    return df
+
+
+def is_group_sorted(df: pd.DataFrame) -> bool:
+    """Whether rows are still in (commodity, region, date) order."""
+    # A re-sorted copy keeps attrs but loses its increasing index
+    return (
+        bool(df.attrs.get(GROUP_SORTED_ATTR))
+        and isinstance(df[COL_COMMODITY].dtype, pd.CategoricalDtype)
+        and isinstance(df[COL_REGION].dtype, pd.CategoricalDtype)
+        and df.index.is_monotonic_increasing
+    )
+
+
+def _code_bounds(codes: np.ndarray, code: int, lo: int, hi: int) -> Tuple[int, int]:
+    """Bounds of the run of `code` inside sorted codes[lo:hi]."""
+    block = codes[lo:hi]
+    # Search with the codes' own dtype: a wider key (get_indexer returns
+    # int64, codes are usually int8) makes NumPy cast the whole block first
+    code = block.dtype.type(code)
+    return (
+        lo + int(np.searchsorted(block, code, side="left")),
+        lo + int(np.searchsorted(block, code, side="right")),
+    )
+
+
+def _date_run_bounds(
+    dates: np.ndarray,
+    lo: int,
+    hi: int,
+    start: np.datetime64,
+    end: np.datetime64
+) -> Tuple[int, int]:
+    """Bounds of the rows inside [start, end] within date-sorted dates[lo:hi]."""
+    block = dates[lo:hi]
+    return (
+        lo + int(np.searchsorted(block, start, side="left")),
+        lo + int(np.searchsorted(block, end, side="right")),
+    )
+
+
+def slice_dates(
+    df: pd.DataFrame,
+    date_range: Optional[Tuple[datetime, datetime]]
+) -> pd.DataFrame:
+    """
+    Restrict a single date-ordered series to a date range.
+    
+    Same result as df[build_mask(df, date_range=date_range)], but the
+    bounds are found by binary search and the result is a slice. Frames
+    whose dates are not in order fall back to the mask.
+    
+    Args:
+        df: Frame of one series (e.g. one commodity/region) in date order.
+        date_range: Optional (start, end) date tuple, both inclusive.
+        
+    Returns:
+        DataFrame slice.
+    """
+    if not date_range:
+        return df
+    
+    if not df[COL_DATE].is_monotonic_increasing:
+        return df[build_mask(df, date_range=date_range)]
+    
+    start, stop = _date_run_bounds(df[COL_DATE].to_numpy(), 0, len(df), *_date_bounds(date_range))
+    return df.iloc[start:stop]
+
+
+def select_rows(
+    df: pd.DataFrame,
+    commodity: Optional[str] = None,
+    regions: Optional[Iterable[str]] = None,
+    date_range: Optional[Tuple[datetime, datetime]] = None
+) -> pd.DataFrame:
+    """
+    Select rows for the usual commodity/region/date filters.
+    
+    Same result as df[build_mask(...)]. On group-sorted frames the
+    commodity, region and date bounds are found by binary search, so the
+    cost is O(log N) plus the size of the result instead of a full scan.
+    
+    Args:
+        df: Canonical DataFrame.
+        commodity: Commodity name.
+        regions: Region names.
+        date_range: Optional (start, end) date tuple, both inclusive.
+        
+    Returns:
+        Filtered DataFrame in the original row order.
+    """
+    if commodity is None or not is_group_sorted(df):
+        return df[build_mask(df, commodity, regions, date_range)]
+    
+    commodity_code = df[COL_COMMODITY].cat.categories.get_indexer([commodity])[0]
+    if commodity_code < 0:
+        return df.iloc[0:0]
+    
+    commodity_codes = df[COL_COMMODITY].cat.codes.to_numpy()
+    lo, hi = _code_bounds(commodity_codes, commodity_code, 0, len(df))
+    
+    if regions is None:
+        block = df.iloc[lo:hi]
+        if date_range:
+            block = block[build_mask(block, date_range=date_range)]
+        return block
+    
+    region_codes = df[COL_REGION].cat.categories.get_indexer(list(regions))
+    region_codes = np.unique(region_codes[region_codes >= 0])
+    all_region_codes = df[COL_REGION].cat.codes.to_numpy()
+    dates = df[COL_DATE].to_numpy()
+    
+    # Converted once, not per region
+    if date_range:
+        date_start, date_end = _date_bounds(date_range)
+    
+    pieces = []
+    for region_code in region_codes:
+        start, stop = _code_bounds(all_region_codes, region_code, lo, hi)
+        if date_range and start < stop:
+            start, stop = _date_run_bounds(dates, start, stop, date_start, date_end)
+        if start < stop:
+            pieces.append((start, stop))
+    
+    if len(pieces) == 1:
+        return df.iloc[pieces[0][0]:pieces[0][1]]
+    
+    if not pieces:
+        return df.iloc[0:0]
+    
+    return df.iloc[np.concatenate([np.arange(start, stop) for start, stop in pieces])]
+
+
+def set_fingerprint(df: pd.DataFrame, digest: str) -> None:
+    """
+    Tag the processed dataset with a fingerprint of its source files.
+    
+    pandas copies attrs onto every derived frame, so the fingerprint also
+    records the shape it belongs to; hash_frame only trusts it for frames
+    that still have exactly that shape. The tagged frame is read-only: a
+    same-shape copy that is reordered or edited must drop FINGERPRINT_ATTR
+    (e.g. copy.attrs.pop(FINGERPRINT_ATTR)) to be hashed by content.
+    
+    Args:
+        df: Processed canonical DataFrame.
+        digest: Identifier of the source data (e.g. the Parquet cache name).
+    """
+    df.attrs[FINGERPRINT_ATTR] = (digest, len(df), tuple(df.columns))
+
+
+def hash_frame(df: pd.DataFrame) -> str:
+    """
+    Hash a DataFrame for st.cache_data keys.
+    
+    The full dataset hashes in O(1) via its fingerprint, trusting the
+    read-only contract in set_fingerprint; any other frame (filtered
+    subsets, derived tables, copies without the fingerprint) is hashed by
+    content.
+    
+    Args:
+        df: DataFrame passed to a cached function.
+        
+    Returns:
+        Hash string.
+    """
+    fingerprint = df.attrs.get(FINGERPRINT_ATTR)
+    if (
+        fingerprint is not None
+        and fingerprint[1] == len(df)
+        and fingerprint[2] == tuple(df.columns)
+        and df.index.equals(pd.RangeIndex(len(df)))
+    ):
+        return fingerprint[0]
+    
+    row_hashes = pd.util.hash_pandas_object(df, index=True).to_numpy()
+    return hashlib.sha1(row_hashes.tobytes()).hexdigest()
+
+
+# Pass as hash_funcs= to st.cache_data functions that take a DataFrame
+FRAME_HASH_FUNCS = {pd.DataFrame: hash_frame}
+
+
+# =============================================================================
+# CACHED LOADER
+# =============================================================================
+
+def _is_loaded(result: Tuple) -> bool:
+    """Keep only successful loads in the resource cache."""
+    return result[0] is not None and not result[0].empty
+
+
+@st.cache_resource(ttl=3600, show_spinner=False, validate=_is_loaded)
+def load_and_process_data(data_path: str):
+    """
+    Load and process all commodity data with caching.
+    
+    Cached as a shared resource (no pickle round-trip per call), so every
+    session receives the same objects: treat them as read-only and filter
+    or copy instead of mutating in place. Failed loads are not kept, so
+    a fixed data directory is picked up on the next rerun.
+    
+    Args:
+        data_path: Path to the data directory.
+        
+    Returns:
+        Tuple of (processed_df, data_info, quality_stats)
+    """
+    # Loading/processing modules are only needed on a cache miss (and
+    # preprocess imports this module), so they are imported here
+    from .io import (
+        find_data_directory,
+        load_all_commodities,
+        get_data_info,
+        get_processed_cache_path,
+        read_processed_cache,
+        write_processed_cache,
+    )
+    from .preprocess import process_all_commodities, validate_data, get_data_quality_stats
+    
+    # Find data directory
+    data_dir = find_data_directory(data_path)
+    
+    if data_dir is None:
+        return None, {"error": "Data directory not found"}, {}
+    
+    # Reuse the processed dataset from disk while the source files are unchanged
+    cache_path = get_processed_cache_path(data_dir, Path(__file__).parent.parent / PROCESSED_CACHE_DIR)
+    df = read_processed_cache(cache_path)
+    
+    if df is not None and not is_group_sorted(df):
+        # attrs only round-trip through Parquet on pandas >= 2.1; restore the
+        # flag so select_rows keeps its binary-search path
+        df = mark_group_sorted(df)
+    
+    if df is None:
+        # Load raw data
+        raw_data = load_all_commodities(data_dir)
+        
+        if not raw_data:
+            return None, {"error": "No data files found"}, {}
+        
+        # Process to canonical format
+        df = process_all_commodities(raw_data)
+        if not df.empty:
+            write_processed_cache(df, cache_path)
+    
+    # Cheap cache key for downstream st.cache_data functions taking df
+    set_fingerprint(df, cache_path.stem)
+    
+    # Get quality stats (also carries the sorted commodity/region lists and
+    # the date bounds the sidebar needs, so reruns never rescan df for them)
+    quality_stats = get_data_quality_stats(df)
+    
+    # Validate (opt-in: the result is informational only), reusing the
+    # missing-value counts gathered above
+    if os.environ.get(VALIDATE_ENV_VAR, "0") == "1":
+        is_valid, issues = validate_data(df, quality_stats)
+    else:
+        is_valid, issues = None, []
+    
+    # Get data info
+    data_info = get_data_info(data_dir)
+    data_info["is_valid"] = is_valid
+    data_info["issues"] = issues
+    
+    return df, data_info, quality_stats
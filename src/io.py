@@ -6,16 +6,31 @@ Supports both single files and directory scanning for multiple commodity files.
 """
 
 import os
+import hashlib
+from io import BytesIO
+from concurrent.futures import ThreadPoolExecutor
 import pandas as pd
 from pathlib import Path
 from typing import Dict, List, Optional, Tuple
 import warnings
 
+# Optional: Arrow-backed columns for freshly parsed CSVs, parsed by the
+# multithreaded Arrow CSV reader
+try:
+    import pyarrow  # noqa: F401
+    CSV_READ_OPTIONS = {"dtype_backend": "pyarrow"}
+    CSV_ENGINE = "pyarrow"
+except ImportError:
+    CSV_READ_OPTIONS = {}
+    CSV_ENGINE = "c"
+
 from .constants import (
     DATA_FILE_EXTENSION,
     COMMODITY_FOLDER,
     GOOGLE_TREND_FOLDER,
     CURRENCY_FOLDER,
+    PROCESSED_CACHE_VERSION,
+    CSV_EXPORT_CHUNK_ROWS,
 )
 
 
@@ -81,6 +96,19 @@ def list_commodity_files(data_dir: Path) -> List[Tuple[str, Path]]:
     return sorted(files, key=lambda x: x[0])
 
 
+def _read_csv(file_path: Path, encoding: str) -> pd.DataFrame:
+    """Read a CSV with CSV_ENGINE, falling back to the default C parser."""
+    if CSV_ENGINE == "pyarrow":
+        try:
+            return pd.read_csv(file_path, encoding=encoding, engine="pyarrow", **CSV_READ_OPTIONS)
+        except Exception:
+            # The Arrow reader is stricter (ragged rows, undecodable bytes);
+            # the C parser below reports or tolerates those as before
+            pass
+    
+    return pd.read_csv(file_path, encoding=encoding, **CSV_READ_OPTIONS)
+
+
 def load_single_csv(
     file_path: Path,
     encoding: str = "utf-8"
@@ -88,7 +116,9 @@ def load_single_csv(
     """
     Load a single CSV file with robust error handling.
     
-    Tries multiple encodings if the default fails.
+    Tries multiple encodings if the default fails. When pyarrow is
+    installed, files are parsed by the multithreaded Arrow reader and
+    columns are Arrow-backed instead of one Python object per string cell.
     
     Args:
         file_path: Path to the CSV file.
@@ -101,7 +131,7 @@ def load_single_csv(
     
     for enc in encodings_to_try:
         try:
-            df = pd.read_csv(file_path, encoding=enc)
+            df = _read_csv(file_path, enc)
             return df
         except UnicodeDecodeError:
             continue
@@ -126,10 +156,17 @@ def load_all_commodities(data_dir: Path) -> Dict[str, pd.DataFrame]:
     commodity_files = list_commodity_files(data_dir)
     commodities = {}
     
-    for name, path in commodity_files:
-        df = load_single_csv(path)
-        if df is not None and not df.empty:
-            commodities[name] = df
+    if not commodity_files:
+        return commodities
+    
+    # read_csv releases the GIL while parsing, so threads overlap the files
+    max_workers = min(len(commodity_files), os.cpu_count() or 1)
+    with ThreadPoolExecutor(max_workers=max_workers) as executor:
+        frames = executor.map(load_single_csv, [path for _, path in commodity_files])
+        
+        for (name, _), df in zip(commodity_files, frames):
+            if df is not None and not df.empty:
+                commodities[name] = df
     
     return commodities
 
@@ -242,3 +279,128 @@ def get_data_info(data_dir: Path) -> Dict:
         info["file_count"] = len(files)
     
     return info
+
+
+def get_processed_cache_path(data_dir: Path, cache_dir: Path) -> Path:
+    """
+    Get the Parquet cache path for the processed dataset of a data directory.
+    
+    The file name is a digest of every commodity file's name, size and mtime
+    (plus the cache version), so any change to the source files produces a
+    new path and the old cache is simply ignored.
+    
+    Args:
+        data_dir: Path to the directory containing commodity CSV files.
+        cache_dir: Directory holding cached Parquet files.
+        
+    Returns:
+        Path of the cache file for the current state of data_dir.
+    """
+    digest = hashlib.sha1(f"v{PROCESSED_CACHE_VERSION}|{data_dir.resolve()}".encode())
+    for name, path in list_commodity_files(data_dir):
+        stat = path.stat()
+        digest.update(f"|{name}:{stat.st_size}:{stat.st_mtime_ns}".encode())
+    
+    return cache_dir / f"processed_{digest.hexdigest()[:16]}.parquet"
+
+
+def read_processed_cache(cache_path: Path) -> Optional[pd.DataFrame]:
+    """
+    Read a cached processed dataset.
+    
+    pandas >= 2.1 restores the frame's attrs (e.g. the group-sorted flag)
+    from the Parquet metadata; the loader re-checks them regardless.
+    
+    Args:
+        cache_path: Path returned by get_processed_cache_path.
+        
+    Returns:
+        DataFrame if the cache exists and is readable, None otherwise.
+    """
+    if not cache_path.exists():
+        return None
+    
+    try:
+        # Memory-map the file instead of reading it through a buffered stream
+        return pd.read_parquet(cache_path, memory_map=True)
+    except Exception as e:
+        # Missing pyarrow or a truncated file - fall back to the CSV pipeline
+        warnings.warn(f"Could not read cache {cache_path}: {str(e)}")
+        return None
+
+
+def write_processed_cache(df: pd.DataFrame, cache_path: Path) -> bool:
+    """
+    Write the processed dataset to the Parquet cache.
+    
+    Older cache files in the same directory are removed.
+    
+    Args:
+        df: Processed canonical DataFrame.
+        cache_path: Path returned by get_processed_cache_path.
+        
+    Returns:
+        True if the cache was written, False otherwise.
+    """
+    try:
+        cache_path.parent.mkdir(parents=True, exist_ok=True)
+        tmp_path = cache_path.with_suffix(".tmp")
+        df.to_parquet(tmp_path, compression="zstd", index=False)
+        os.replace(tmp_path, cache_path)
+    except Exception as e:
+        warnings.warn(f"Could not write cache {cache_path}: {str(e)}")
+        return False
+    
+    for old in cache_path.parent.glob("processed_*.parquet"):
+        if old != cache_path:
+            try:
+                old.unlink()
+            except OSError:
+                pass
+    
+    return True
+
+
+def to_csv_bytes(df: pd.DataFrame, index: bool = False) -> bytes:
+    """
+    Serialize a DataFrame to UTF-8 CSV bytes for st.download_button.
+    
+    Rows are encoded batch by batch straight into a byte buffer, so the
+    whole file never exists as an intermediate Python str as well.
+    
+    Args:
+        df: DataFrame to export.
+        index: Whether to write the index.
+        
+    Returns:
+        CSV file contents.
+    """
+    buffer = BytesIO()
+    df.to_csv(buffer, index=index, chunksize=CSV_EXPORT_CHUNK_ROWS)
+    return buffer.getvalue()
+
+
+def to_parquet_bytes(df: pd.DataFrame, index: bool = False) -> bytes:
+    """
+    Serialize a DataFrame to zstd-compressed Parquet bytes.
+    
+    Columnar and typed, so nothing is formatted as text; much smaller and
+    faster to write than CSV. Needs pyarrow (see EXPORT_FORMATS).
+    
+    Args:
+        df: DataFrame to export.
+        index: Whether to write the index.
+        
+    Returns:
+        Parquet file contents.
+    """
+    buffer = BytesIO()
+    df.to_parquet(buffer, compression="zstd", index=index)
+    return buffer.getvalue()
+
+
+# Download formats offered by the pages: name -> (file extension, MIME
+# type, serializer). Parquet is only listed when pyarrow is installed
+EXPORT_FORMATS = {"CSV": ("csv", "text/csv", to_csv_bytes)}
+if CSV_ENGINE == "pyarrow":
+    EXPORT_FORMATS["Parquet"] = ("parquet", "application/vnd.apache.parquet", to_parquet_bytes)
@@ -10,6 +10,7 @@ Computes all derived metrics used in the dashboard:
 - Top movers
 """
 
+import streamlit as st
 import pandas as pd
 import numpy as np
 from typing import Dict, List, Optional, Tuple
@@ -20,13 +21,35 @@ from .constants import (
     COL_COMMODITY,
     COL_REGION,
     COL_PRICE,
+    COL_DAILY_CHANGE,
     CANONICAL_COLUMNS,
     ANOMALY_THRESHOLD_PCT,
     ANOMALY_STD_MULTIPLIER,
     TREND_RISING_THRESHOLD,
     TREND_FALLING_THRESHOLD,
     TOP_MOVERS_COUNT,
+    METRICS_CACHE_MAX_ENTRIES,
 )
+from .data_loader import select_rows, is_group_sorted, FRAME_HASH_FUNCS
+from .preprocess import get_sorted_labels, rolling_mean
+
+# Memoizes the page-level metrics per (dataset, filters); the full dataset
+# is keyed by its fingerprint rather than hashed row by row
+_cache_metric = st.cache_data(
+    max_entries=METRICS_CACHE_MAX_ENTRIES,
+    show_spinner=False,
+    hash_funcs=FRAME_HASH_FUNCS,
+)
+
+
+def _price_series(
+    df: pd.DataFrame,
+    commodity: str,
+    region: str,
+    date_range: Optional[Tuple[datetime, datetime]] = None
+) -> pd.DataFrame:
+    """Date-sorted rows with a price for one commodity/region combination."""
+    return select_rows(df, commodity, [region], date_range).sort_values(COL_DATE)
 
 
 def get_latest_price(
@@ -45,9 +68,11 @@ def get_latest_price(
     Returns:
         Latest price value, or None if not found.
     """
-    mask = (df[COL_COMMODITY] == commodity) & (df[COL_REGION] == region)
-    subset = df[mask].dropna(subset=[COL_PRICE])
-    
+    return _latest_price(_price_series(df, commodity, region))
+
+
+def _latest_price(subset: pd.DataFrame) -> Optional[float]:
+    """get_latest_price on a precomputed _price_series slice."""
     if subset.empty:
         return None
     
@@ -73,20 +98,18 @@ def get_price_at_date(
     Returns:
         Price value closest to target date, or None if not found.
     """
-    mask = (df[COL_COMMODITY] == commodity) & (df[COL_REGION] == region)
-    subset = df[mask].dropna(subset=[COL_PRICE])
+    subset = select_rows(df, commodity, [region])
     
     if subset.empty:
         return None
     
-    # Find closest date
-    subset = subset.copy()
-    subset['date_diff'] = abs(subset[COL_DATE] - pd.Timestamp(target_date))
-    closest = subset.loc[subset['date_diff'].idxmin()]
+    # Find closest date (computed on the side; the slice is only read)
+    date_diff = abs(subset[COL_DATE] - pd.Timestamp(target_date))
+    closest = date_diff.idxmin()
     
     # Only return if within 3 days
-    if closest['date_diff'] <= timedelta(days=3):
-        return float(closest[COL_PRICE])
+    if date_diff[closest] <= timedelta(days=3):
+        return float(subset.at[closest, COL_PRICE])
     
     return None
 
@@ -109,9 +132,11 @@ def calculate_price_change(
     Returns:
         Tuple of (absolute_change, percentage_change), or (None, None) if unavailable.
     """
-    mask = (df[COL_COMMODITY] == commodity) & (df[COL_REGION] == region)
-    subset = df[mask].dropna(subset=[COL_PRICE]).sort_values(COL_DATE)
-    
+    return _price_change(_price_series(df, commodity, region), days)
+
+
+def _price_change(subset: pd.DataFrame, days: int) -> Tuple[Optional[float], Optional[float]]:
+    """calculate_price_change on a precomputed _price_series slice."""
     if len(subset) < 2:
         return None, None
     
@@ -177,9 +202,11 @@ def calculate_volatility(
     Returns:
         Volatility value (std of % changes), or None if unavailable.
     """
-    mask = (df[COL_COMMODITY] == commodity) & (df[COL_REGION] == region)
-    subset = df[mask].dropna(subset=[COL_PRICE]).sort_values(COL_DATE)
-    
+    return _volatility(_price_series(df, commodity, region), days)
+
+
+def _volatility(subset: pd.DataFrame, days: int) -> Optional[float]:
+    """calculate_volatility on a precomputed _price_series slice."""
     if len(subset) < 5:
         return None
     
@@ -201,6 +228,7 @@ def calculate_volatility(
     return round(volatility, 2)
 
 
+@_cache_metric
 def get_kpi_summary(
     df: pd.DataFrame,
     commodity: str,
@@ -217,11 +245,17 @@ def get_kpi_summary(
     Returns:
         Dictionary with all KPI values.
     """
-    latest_price = get_latest_price(df, commodity, region)
-    abs_7d, pct_7d = calculate_price_change(df, commodity, region, 7)
-    abs_30d, pct_30d = calculate_price_change(df, commodity, region, 30)
+    return _kpi_summary(_price_series(df, commodity, region))
+
+
+def _kpi_summary(subset: pd.DataFrame) -> Dict:
+    """get_kpi_summary on a precomputed _price_series slice."""
+    # One slice shared across the individual metrics
+    latest_price = _latest_price(subset)
+    abs_7d, pct_7d = _price_change(subset, 7)
+    abs_30d, pct_30d = _price_change(subset, 30)
     trend = determine_trend_status(pct_7d)
-    volatility = calculate_volatility(df, commodity, region, 30)
+    volatility = _volatility(subset, 30)
     
     return {
         "latest_price": latest_price,
@@ -252,17 +286,16 @@ def calculate_moving_average(
     Returns:
         DataFrame with original data plus MA column.
     """
-    mask = (df[COL_COMMODITY] == commodity) & (df[COL_REGION] == region)
-    subset = df[mask].dropna(subset=[COL_PRICE]).sort_values(COL_DATE).copy()
+    # sort_values returns a new frame, so columns can be added without a copy
+    subset = select_rows(df, commodity, [region]).sort_values(COL_DATE)
     
-    if len(subset) < window:
-        subset[f'MA{window}'] = np.nan
-    else:
-        subset[f'MA{window}'] = subset[COL_PRICE].rolling(window=window).mean()
+    # All NaN when the series is shorter than the window
+    subset[f'MA{window}'] = rolling_mean(subset[COL_PRICE].to_numpy(), window)
     
     return subset
 
 
+@_cache_metric
 def detect_anomalies(
     df: pd.DataFrame,
     commodity: str,
@@ -281,30 +314,31 @@ def detect_anomalies(
     Returns:
         DataFrame with anomaly markers.
     """
-    mask = (df[COL_COMMODITY] == commodity) & (df[COL_REGION] == region)
-    subset = df[mask].dropna(subset=[COL_PRICE]).sort_values(COL_DATE).copy()
+    subset = select_rows(df, commodity, [region]).sort_values(COL_DATE)
     
     if len(subset) < 3:
-        subset['daily_change_pct'] = np.nan
+        subset[COL_DAILY_CHANGE] = np.nan
         subset['is_anomaly'] = False
         return subset
     
-    # Calculate daily percentage change
-    subset['daily_change_pct'] = subset[COL_PRICE].pct_change() * 100
+    # Daily percentage change (precomputed by the loader over the full series)
+    if COL_DAILY_CHANGE not in subset.columns:
+        subset[COL_DAILY_CHANGE] = subset[COL_PRICE].pct_change() * 100
     
     if method == "threshold":
         # Anomaly if absolute change > threshold
-        subset['is_anomaly'] = abs(subset['daily_change_pct']) > ANOMALY_THRESHOLD_PCT
+        subset['is_anomaly'] = abs(subset[COL_DAILY_CHANGE]) > ANOMALY_THRESHOLD_PCT
     else:
         # Anomaly if change > 2 standard deviations
-        mean_change = subset['daily_change_pct'].mean()
-        std_change = subset['daily_change_pct'].std()
+        mean_change = subset[COL_DAILY_CHANGE].mean()
+        std_change = subset[COL_DAILY_CHANGE].std()
         threshold = ANOMALY_STD_MULTIPLIER * std_change
-        subset['is_anomaly'] = abs(subset['daily_change_pct'] - mean_change) > threshold
+        subset['is_anomaly'] = abs(subset[COL_DAILY_CHANGE] - mean_change) > threshold
     
     return subset
 
 
+@_cache_metric
 def get_top_movers(
     df: pd.DataFrame,
     commodity: str,
@@ -323,23 +357,47 @@ def get_top_movers(
     Returns:
         Tuple of (top_gainers_df, top_losers_df).
     """
-    mask = df[COL_COMMODITY] == commodity
-    subset = df[mask].dropna(subset=[COL_PRICE])
+    subset = select_rows(df, commodity)
     
     if subset.empty:
         empty_df = pd.DataFrame(columns=[COL_REGION, 'change_pct'])
         return empty_df, empty_df
     
-    regions = subset[COL_REGION].unique()
     changes = []
     
-    for region in regions:
-        _, pct_change = calculate_price_change(df, commodity, region, days)
-        if pct_change is not None:
-            changes.append({
-                COL_REGION: region,
-                'change_pct': pct_change
-            })
+    # One pass over NumPy arrays of the commodity's rows instead of a
+    # filter/sort per region: same rule as calculate_price_change
+    if not is_group_sorted(subset):
+        subset = subset.sort_values([COL_REGION, COL_DATE], kind="stable")
+    
+    region_labels = subset[COL_REGION].to_numpy()
+    dates = subset[COL_DATE].to_numpy()
+    prices = subset[COL_PRICE].to_numpy()
+    
+    starts = np.flatnonzero(np.r_[True, region_labels[1:] != region_labels[:-1]])
+    stops = np.r_[starts[1:], len(subset)]
+    lookback = np.timedelta64(timedelta(days=days))
+    
+    for start, stop in zip(starts, stops):
+        if stop - start < 2:
+            continue
+        
+        region_dates = dates[start:stop]
+        target_date = region_dates[-1] - lookback
+        
+        # Last price on or before the target date, else the earliest one
+        earlier = int(np.searchsorted(region_dates, target_date, side="right")) - 1
+        earlier_price = float(prices[start + max(earlier, 0)])
+        
+        if earlier_price == 0:
+            continue
+        
+        latest_price = float(prices[stop - 1])
+        pct_change = 100 * (latest_price - earlier_price) / earlier_price
+        changes.append({
+            COL_REGION: region_labels[start],
+            'change_pct': round(pct_change, 2)
+        })
     
     if not changes:
         empty_df = pd.DataFrame(columns=[COL_REGION, 'change_pct'])
@@ -356,6 +414,7 @@ def get_top_movers(
     return top_gainers.reset_index(drop=True), top_losers.reset_index(drop=True)
 
 
+@_cache_metric
 def get_regional_ranking(
     df: pd.DataFrame,
     commodity: str,
@@ -374,14 +433,7 @@ def get_regional_ranking(
     Returns:
         Tuple of (highest_prices_df, lowest_prices_df).
     """
-    mask = df[COL_COMMODITY] == commodity
-    subset = df[mask].dropna(subset=[COL_PRICE])
-    
-    if date_range:
-        subset = subset[
-            (subset[COL_DATE] >= pd.Timestamp(date_range[0])) &
-            (subset[COL_DATE] <= pd.Timestamp(date_range[1]))
-        ]
+    subset = select_rows(df, commodity, date_range=date_range)
     
     if subset.empty:
         empty_df = pd.DataFrame(columns=[COL_REGION, COL_PRICE])
@@ -393,7 +445,7 @@ def get_regional_ranking(
     
     # If no data for latest date, get most recent per region
     if latest_prices.empty:
-        idx = subset.groupby(COL_REGION)[COL_DATE].idxmax()
+        idx = subset.groupby(COL_REGION, observed=True)[COL_DATE].idxmax()
         latest_prices = subset.loc[idx][[COL_REGION, COL_PRICE]]
     
     # Remove duplicates (keep first)
@@ -408,10 +460,12 @@ def get_regional_ranking(
     return highest, lowest
 
 
+@_cache_metric
 def get_regional_volatility_comparison(
     df: pd.DataFrame,
     commodity: str,
-    days: int = 30
+    days: int = 30,
+    date_range: Optional[Tuple[datetime, datetime]] = None
 ) -> pd.DataFrame:
     """
     Get average price vs volatility for all regions.
@@ -420,21 +474,22 @@ def get_regional_volatility_comparison(
         df: Canonical DataFrame.
         commodity: Commodity name.
         days: Number of days for volatility calculation.
+        date_range: Optional (start, end) date tuple.
         
     Returns:
         DataFrame with region, avg_price, and volatility columns.
     """
-    mask = df[COL_COMMODITY] == commodity
-    subset = df[mask].dropna(subset=[COL_PRICE])
+    subset = select_rows(df, commodity, date_range=date_range)
     
     if subset.empty:
         return pd.DataFrame(columns=[COL_REGION, 'avg_price', 'volatility'])
     
-    regions = subset[COL_REGION].unique()
     results = []
     
-    for region in regions:
-        region_data = subset[subset[COL_REGION] == region]
+    # One grouping pass hands out each region's rows instead of a boolean
+    # scan of the whole commodity slice per region
+    for region, region_data in subset.groupby(COL_REGION, observed=True, sort=False):
+        region_data = region_data.sort_values(COL_DATE)
         
         # Filter to recent days
         latest_date = region_data[COL_DATE].max()
@@ -445,7 +500,7 @@ def get_regional_volatility_comparison(
             continue
         
         avg_price = recent[COL_PRICE].mean()
-        volatility = calculate_volatility(df, commodity, region, days)
+        volatility = _volatility(region_data, days)
         
         if volatility is not None:
             results.append({
@@ -473,8 +528,7 @@ def resample_to_weekly(
     Returns:
         DataFrame with weekly aggregated data.
     """
-    mask = (df[COL_COMMODITY] == commodity) & (df[COL_REGION] == region)
-    subset = df[mask].dropna(subset=[COL_PRICE]).copy()
+    subset = select_rows(df, commodity, [region])
     
     if subset.empty:
         return subset
@@ -487,6 +541,7 @@ def resample_to_weekly(
     return weekly[CANONICAL_COLUMNS]
 
 
+@_cache_metric
 def generate_auto_insights(
     df: pd.DataFrame,
     commodity: str,
@@ -515,8 +570,7 @@ def generate_auto_insights(
         )
     
     # Peak price insight
-    mask = (df[COL_COMMODITY] == commodity) & (df[COL_REGION] == region)
-    subset = df[mask].dropna(subset=[COL_PRICE])
+    subset = select_rows(df, commodity, [region])
     
     if not subset.empty:
         peak_idx = subset[COL_PRICE].idxmax()
@@ -545,10 +599,12 @@ def generate_auto_insights(
     return insights
 
 
+@_cache_metric
 def get_commodity_summary(
     df: pd.DataFrame,
     commodities: List[str],
-    region: str
+    region: str,
+    date_range: Optional[Tuple[datetime, datetime]] = None
 ) -> pd.DataFrame:
     """
     Get summary statistics for multiple commodities.
@@ -557,6 +613,7 @@ def get_commodity_summary(
         df: Canonical DataFrame.
         commodities: List of commodity names.
         region: Region name to analyze.
+        date_range: Optional (start, end) date tuple.
         
     Returns:
         DataFrame with summary statistics per commodity.
@@ -564,7 +621,7 @@ def get_commodity_summary(
     summaries = []
     
     for commodity in commodities:
-        kpi = get_kpi_summary(df, commodity, region)
+        kpi = _kpi_summary(_price_series(df, commodity, region, date_range))
         
         summaries.append({
             COL_COMMODITY: commodity,
@@ -576,3 +633,50 @@ def get_commodity_summary(
         })
     
     return pd.DataFrame(summaries)
+
+
+@_cache_metric
+def get_regional_summary(
+    df: pd.DataFrame,
+    commodity: str,
+    date_range: Optional[Tuple[datetime, datetime]] = None
+) -> pd.DataFrame:
+    """
+    Get price statistics per region for one commodity.
+    
+    Args:
+        df: Canonical DataFrame.
+        commodity: Commodity name.
+        date_range: Optional (start, end) date tuple.
+        
+    Returns:
+        DataFrame indexed by region with avg_price, min_price, max_price,
+        std_price and latest_price columns, rounded to whole Rupiah.
+    """
+    subset = select_rows(df, commodity, date_range=date_range)
+    
+    return subset.groupby(COL_REGION, observed=True)[COL_PRICE].agg(
+        avg_price='mean',
+        min_price='min',
+        max_price='max',
+        std_price='std',
+        latest_price='last',
+    ).round(0)
+
+
+@_cache_metric
+def get_available_commodities(
+    df: pd.DataFrame,
+    date_range: Optional[Tuple[datetime, datetime]] = None
+) -> List[str]:
+    """
+    Get the sorted commodities that have rows in a date range.
+    
+    Args:
+        df: Canonical DataFrame.
+        date_range: Optional (start, end) date tuple.
+        
+    Returns:
+        Sorted list of commodity names.
+    """
+    return get_sorted_labels(select_rows(df, date_range=date_range)[COL_COMMODITY])
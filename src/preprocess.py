@@ -6,11 +6,12 @@ Handles:
 - Price parsing (removes commas, currency symbols)
 - Wide-to-long format conversion
 - Data validation and canonicalization
+- Derived per-series columns (moving averages, daily changes)
 """
 
 import pandas as pd
 import numpy as np
-from typing import Dict, List, Optional, Tuple
+from typing import Dict, List, Optional, Sequence, Tuple
 import warnings
 import re
 
@@ -19,12 +20,16 @@ from .constants import (
     COL_COMMODITY,
     COL_REGION,
     COL_PRICE,
+    COL_MA7,
+    COL_MA14,
+    COL_DAILY_CHANGE,
     CANONICAL_COLUMNS,
     DEFAULT_REGION,
     DATE_COLUMN_PATTERNS,
     NON_REGION_COLUMNS,
     DATE_FORMATS,
 )
+from .data_loader import mark_group_sorted
 
 
 def identify_date_column(df: pd.DataFrame) -> Optional[str]:
@@ -69,6 +74,11 @@ def parse_date_column(series: pd.Series) -> pd.Series:
     if pd.api.types.is_datetime64_any_dtype(series):
         return series
     
+    # Dates already typed by the Arrow CSV parser (date32/timestamp); the
+    # cast to an Arrow timestamp first keeps the conversion vectorized
+    if isinstance(series.dtype, pd.ArrowDtype) and series.dtype.kind == "M":
+        return series.astype("timestamp[ns][pyarrow]").astype("datetime64[ns]")
+    
     # Try pandas automatic parsing first
     try:
         return pd.to_datetime(series)
@@ -130,13 +140,42 @@ def parse_price_column(series: pd.Series) -> pd.Series:
     """
     Parse a series of price values.
     
+    Vectorized equivalent of applying parse_price_value to every element:
+    numeric columns are cast directly and text is cleaned with one regex
+    pass over the whole column.
+    
     Args:
         series: Input series with price values.
         
     Returns:
         Series with float price values.
     """
-    return series.apply(parse_price_value)
+    if pd.api.types.is_numeric_dtype(series):
+        return series.astype(float)
+    
+    try:
+        text = series.str
+    except AttributeError:
+        # Object column without any strings
+        return pd.to_numeric(series, errors="coerce").astype(float)
+    
+    is_text = text.len().notna()
+    cleaned = text.replace(r"[Rp$€£¥,\s.]", "", regex=True)
+    
+    # Accounting negatives "(1000)" -> "-1000". Done with a mask and a slice
+    # because Arrow-backed strings (the pyarrow CSV path) do not support
+    # regex backreferences in str.replace
+    negative = cleaned.str.startswith("(", na=False) & cleaned.str.endswith(")", na=False)
+    if negative.any():
+        cleaned = cleaned.where(~negative, "-" + cleaned.str.slice(1, -1))
+    
+    prices = pd.to_numeric(cleaned, errors="coerce")
+    
+    if not is_text.all():
+        # Mixed column: non-string cells keep their numeric value
+        prices = prices.where(is_text, pd.to_numeric(series.where(~is_text), errors="coerce"))
+    
+    return prices.astype(float)
 
 
 def is_wide_format(df: pd.DataFrame, date_col: str) -> bool:
@@ -326,6 +365,9 @@ def process_all_commodities(
     """
     Process all commodity DataFrames and combine into single canonical DataFrame.
     
+    Rows without a date or price are dropped per commodity, so every row
+    of the result has a price and slices of it never need dropna.
+    
     Args:
         commodity_data: Dictionary mapping commodity names to raw DataFrames.
         
@@ -349,6 +391,28 @@ def process_all_commodities(
     # Combine all processed DataFrames
     df_combined = pd.concat(processed, ignore_index=True)
     
+    # Compact dtypes: prices fit comfortably in float32 and dates must be
+    # datetime64 rather than object so every later scan stays vectorized
+    df_combined[COL_PRICE] = pd.to_numeric(df_combined[COL_PRICE], downcast="float")
+    if not pd.api.types.is_datetime64_any_dtype(df_combined[COL_DATE]):
+        df_combined[COL_DATE] = pd.to_datetime(df_combined[COL_DATE], errors="coerce")
+    
+    # Low-cardinality labels as sorted, ordered categoricals: the categories
+    # double as the sorted option lists and equality checks compare codes
+    for col in (COL_COMMODITY, COL_REGION):
+        df_combined[col] = pd.Categorical(
+            df_combined[col],
+            categories=sorted(df_combined[col].dropna().unique()),
+            ordered=True,
+        )
+    
+    # Group-contiguous rows let filters slice by binary search
+    df_combined = mark_group_sorted(df_combined)
+    
+    # Moving averages and daily changes are fixed per series, so compute
+    # them once here instead of on every chart/anomaly rerun
+    df_combined = add_derived_columns(df_combined)
+    
     # Final validation
     assert all(col in df_combined.columns for col in CANONICAL_COLUMNS), \
         "Missing required columns after processing"
@@ -356,13 +420,120 @@ def process_all_commodities(
     return df_combined
 
 
-def validate_data(df: pd.DataFrame) -> Tuple[bool, List[str]]:
+def rolling_means(
+    values: np.ndarray,
+    windows: Sequence[int],
+    starts: Optional[np.ndarray] = None
+) -> List[np.ndarray]:
+    """
+    Trailing means over several window lengths, NaN until each is full.
+    
+    Same values as Series.rolling(window).mean() (per series when `starts`
+    is given), taken as differences of one cumulative sum shared by all
+    windows instead of pandas' per-call rolling machinery.
+    
+    Args:
+        values: Prices without missing values, each series contiguous
+            and in date order.
+        windows: Window lengths.
+        starts: Optional position of the first row of each row's series;
+            None treats all values as one series.
+            
+    Returns:
+        One float64 ndarray aligned with values per window.
+    """
+    values = np.asarray(values, dtype=np.float64)
+    positions = np.arange(len(values))
+    
+    csum = np.zeros(len(values) + 1)
+    np.cumsum(values, out=csum[1:])
+    
+    # Rows seen so far in each row's series, minus one
+    offsets = positions - (0 if starts is None else starts)
+    
+    means = []
+    for window in windows:
+        full = offsets >= window - 1
+        end = positions[full] + 1
+        
+        out = np.full(len(values), np.nan)
+        out[full] = (csum[end] - csum[end - window]) / window
+        means.append(out)
+    
+    return means
+
+
+def rolling_mean(
+    values: np.ndarray,
+    window: int,
+    starts: Optional[np.ndarray] = None
+) -> np.ndarray:
+    """
+    Trailing mean over `window` values, NaN until the window is full.
+    
+    Single-window form of rolling_means.
+    
+    Args:
+        values: Prices without missing values, each series contiguous
+            and in date order.
+        window: Window length.
+        starts: Optional position of the first row of each row's series;
+            None treats all values as one series.
+            
+    Returns:
+        float64 ndarray aligned with values.
+    """
+    return rolling_means(values, (window,), starts)[0]
+
+
+def add_derived_columns(df: pd.DataFrame) -> pd.DataFrame:
+    """
+    Add 7/14-day moving averages and daily % change per series.
+    
+    Each (commodity, region) series is processed in date order with
+    missing prices skipped; rows without a price get NaN.
+    
+    Args:
+        df: Canonical DataFrame sorted by (commodity, region, date).
+        
+    Returns:
+        DataFrame with COL_MA7, COL_MA14 and COL_DAILY_CHANGE added.
+    """
+    has_price = df[COL_PRICE].notna().to_numpy()
+    valid = df[has_price]
+    prices = valid.groupby([COL_COMMODITY, COL_REGION], observed=True, sort=False)[COL_PRICE]
+    
+    # Series are contiguous, so each one starts where either code changes
+    commodity_codes = valid[COL_COMMODITY].cat.codes.to_numpy()
+    region_codes = valid[COL_REGION].cat.codes.to_numpy()
+    is_start = np.ones(len(valid), dtype=bool)
+    is_start[1:] = (commodity_codes[1:] != commodity_codes[:-1]) | (region_codes[1:] != region_codes[:-1])
+    starts = np.maximum.accumulate(np.where(is_start, np.arange(len(valid)), 0))
+    
+    # Both averages come from one cumulative sum; float32 like the prices
+    means = rolling_means(valid[COL_PRICE].to_numpy(), (7, 14), starts)
+    for col, mean in zip((COL_MA7, COL_MA14), means):
+        ma = np.full(len(df), np.nan, dtype=np.float32)
+        ma[has_price] = mean
+        df[col] = ma
+    
+    df[COL_DAILY_CHANGE] = prices.pct_change(fill_method=None) * 100
+    
+    return df
+
+
+def validate_data(
+    df: pd.DataFrame,
+    quality_stats: Optional[Dict] = None
+) -> Tuple[bool, List[str]]:
     """
     Validate the canonical DataFrame.
     
     Args:
         df: DataFrame to validate.
-        
+        quality_stats: Optional output of get_data_quality_stats for the same
+            frame; its missing counts are reused instead of rescanning prices.
+            
     Returns:
         Tuple of (is_valid, list_of_issues).
     """
@@ -388,7 +559,12 @@ def validate_data(df: pd.DataFrame) -> Tuple[bool, List[str]]:
         issues.append("DataFrame is empty")
     
     # Check for all null values
-    if df[COL_PRICE].isna().all():
+    if quality_stats is not None and COL_PRICE in quality_stats["missing_counts"]:
+        all_null = quality_stats["missing_counts"][COL_PRICE] == len(df)
+    else:
+        all_null = df[COL_PRICE].isna().all()
+    
+    if all_null:
         issues.append("All price values are null")
     
     is_valid = len(issues) == 0
@@ -413,6 +589,8 @@ def get_data_quality_stats(df: pd.DataFrame) -> Dict:
             "date_range": None,
             "commodities": [],
             "regions": [],
+            "default_commodity": None,
+            "default_region": None,
         }
     
     stats = {
@@ -424,24 +602,53 @@ def get_data_quality_stats(df: pd.DataFrame) -> Dict:
         "regions": [],
     }
     
-    # Missing value counts
-    for col in df.columns:
-        missing = df[col].isna().sum()
+    # Missing value counts (one vectorized pass over all columns)
+    missing_counts = df.isna().sum()
+    for col, missing in missing_counts.items():
         stats["missing_counts"][col] = int(missing)
-        stats["missing_pcts"][col] = round(100 * missing / len(df), 2) if len(df) > 0 else 0
-    
-    # Date range
-    if COL_DATE in df.columns and not df[COL_DATE].isna().all():
-        stats["date_range"] = {
-            "min": df[COL_DATE].min().strftime("%Y-%m-%d"),
-            "max": df[COL_DATE].max().strftime("%Y-%m-%d"),
-        }
+        stats["missing_pcts"][col] = round(100 * missing / len(df), 2)
+    
+    # Date range (NaT is skipped by min/max, so an all-NaT column gives NaT)
+    if COL_DATE in df.columns:
+        date_min, date_max = df[COL_DATE].min(), df[COL_DATE].max()
+        if pd.notna(date_min):
+            stats["date_range"] = {
+                "min": date_min.strftime("%Y-%m-%d"),
+                "max": date_max.strftime("%Y-%m-%d"),
+            }
+            # Same bounds as date objects for the sidebar date picker
+            stats["min_date"] = date_min.date()
+            stats["max_date"] = date_max.date()
     
     # Unique values
     if COL_COMMODITY in df.columns:
-        stats["commodities"] = sorted(df[COL_COMMODITY].dropna().unique().tolist())
+        stats["commodities"] = get_sorted_labels(df[COL_COMMODITY])
     
     if COL_REGION in df.columns:
-        stats["regions"] = sorted(df[COL_REGION].dropna().unique().tolist())
+        stats["regions"] = get_sorted_labels(df[COL_REGION])
+    
+    # Default sidebar selections (the first row), so the sidebar never
+    # rescans df for them
+    stats["default_commodity"] = df[COL_COMMODITY].iloc[0] if COL_COMMODITY in df.columns else None
+    stats["default_region"] = df[COL_REGION].iloc[0] if COL_REGION in df.columns else None
     
     return stats
+
+
+def get_sorted_labels(series: pd.Series) -> List[str]:
+    """
+    Get the sorted distinct labels present in a label column.
+    
+    For categoricals this counts integer codes instead of sorting strings.
+    
+    Args:
+        series: Commodity or region column.
+        
+    Returns:
+        Sorted list of labels that occur in the series.
+    """
+    if isinstance(series.dtype, pd.CategoricalDtype):
+        codes = series.cat.codes.to_numpy()
+        counts = np.bincount(codes[codes >= 0], minlength=len(series.cat.categories))
+        return series.cat.categories[counts > 0].tolist()
+    return sorted(series.dropna().unique().tolist())
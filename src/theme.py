@@ -113,20 +113,16 @@ def get_chart_theme() -> dict:
         }
 
 
-def get_theme_css(is_dark: bool = None) -> str:
+def _build_theme_css(is_dark: bool) -> str:
     """
-    Get theme-specific CSS for the dashboard.
+    Build theme-specific CSS for the dashboard.
     
     Args:
-        is_dark: Whether dark mode is active. If None, reads from session_state.
+        is_dark: Whether dark mode is active.
         
     Returns:
         CSS string wrapped in <style> tags.
     """
-    if is_dark is None:
-        init_theme()
-        is_dark = st.session_state.theme_mode == 'dark'
-    
     # Common styles for both themes
     common_css = """
         .main .block-container {
@@ -842,6 +838,25 @@ def get_theme_css(is_dark: bool = None) -> str:
     return f"<style>{common_css}{theme_css}</style>"
 
 
+# Only two possible outputs; build both once per process
+_THEME_CSS = {False: _build_theme_css(False), True: _build_theme_css(True)}
+
+
+def get_theme_css(is_dark: bool = None) -> str:
+    """
+    Get theme-specific CSS for the dashboard.
+    
+    Args:
+        is_dark: Whether dark mode is active. If None, reads from session_state.
+        
+    Returns:
+        CSS string wrapped in <style> tags.
+    """
+    if is_dark is None:
+        is_dark = is_dark_mode()
+    return _THEME_CSS[bool(is_dark)]
+
+
 def apply_theme():
     """Apply theme CSS to the current page. Call this at the top of each page."""
     init_theme()
@@ -0,0 +1,28 @@
+"""Shared fixtures: a small canonical dataset shaped like the loader's."""
+
+import numpy as np
+import pandas as pd
+import pytest
+
+from src.constants import COL_COMMODITY, COL_DATE, COL_PRICE, COL_REGION
+from src.data_loader import mark_group_sorted
+
+
+@pytest.fixture
+def canonical_df() -> pd.DataFrame:
+    """Group-sorted dataset: 3 commodities x 4 regions x 30 days, a few prices missing."""
+    rng = np.random.default_rng(0)
+    commodities = ["Beras", "Cabai", "Gula"]
+    regions = ["Aceh", "Bali", "Jambi", "Papua"]
+    
+    index = pd.MultiIndex.from_product(
+        [commodities, regions, pd.date_range("2022-01-01", periods=30)],
+        names=[COL_COMMODITY, COL_REGION, COL_DATE],
+    )
+    df = index.to_frame(index=False)
+    df[COL_COMMODITY] = pd.Categorical(df[COL_COMMODITY], categories=commodities, ordered=True)
+    df[COL_REGION] = pd.Categorical(df[COL_REGION], categories=regions, ordered=True)
+    df[COL_PRICE] = rng.uniform(10_000, 50_000, len(df)).round().astype(np.float32)
+    df.loc[rng.choice(len(df), size=20, replace=False), COL_PRICE] = np.nan
+    
+    return mark_group_sorted(df[[COL_DATE, COL_COMMODITY, COL_REGION, COL_PRICE]])
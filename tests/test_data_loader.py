@@ -0,0 +1,92 @@
+"""Tests for the row selection and cache hashing in src/data_loader.py."""
+
+from datetime import date
+
+import pandas as pd
+import pytest
+
+from src.constants import COL_COMMODITY, COL_DATE, COL_PRICE, COL_REGION
+from src.data_loader import FINGERPRINT_ATTR, hash_frame, is_group_sorted, select_rows, set_fingerprint, slice_dates
+
+
+def _reference_rows(df, commodity=None, regions=None, date_range=None):
+    """Plain boolean-mask selection the binary search must reproduce."""
+    mask = pd.Series(True, index=df.index)
+    if commodity is not None:
+        mask &= df[COL_COMMODITY] == commodity
+    if regions is not None:
+        mask &= df[COL_REGION].isin(list(regions))
+    if date_range:
+        mask &= (df[COL_DATE] >= pd.Timestamp(date_range[0])) & (df[COL_DATE] <= pd.Timestamp(date_range[1]))
+    return df[mask]
+
+
+@pytest.mark.parametrize("commodity", ["Beras", "Gula", "Jagung", None])
+@pytest.mark.parametrize("regions", [None, ["Bali"], ["Papua", "Aceh"], ["Aceh", "Bali", "Jambi", "Papua"], ["Nowhere"], []])
+@pytest.mark.parametrize("date_range", [
+    None,
+    (date(2022, 1, 5), date(2022, 1, 20)),
+    (date(2022, 1, 10), date(2022, 1, 10)),
+    (date(2021, 12, 1), date(2021, 12, 31)),
+    (date(2021, 12, 1), date(2023, 1, 1)),
+])
+def test_select_rows_matches_boolean_mask(canonical_df, commodity, regions, date_range):
+    assert is_group_sorted(canonical_df)
+    
+    selected = select_rows(canonical_df, commodity, regions, date_range)
+    
+    pd.testing.assert_frame_equal(selected, _reference_rows(canonical_df, commodity, regions, date_range))
+
+
+def test_select_rows_falls_back_on_frames_that_are_not_group_sorted(canonical_df):
+    shuffled = canonical_df.sample(frac=1, random_state=0)
+    date_range = (date(2022, 1, 5), date(2022, 1, 20))
+    
+    assert not is_group_sorted(shuffled)
+    pd.testing.assert_frame_equal(
+        select_rows(shuffled, "Cabai", ["Jambi", "Aceh"], date_range),
+        _reference_rows(shuffled, "Cabai", ["Jambi", "Aceh"], date_range),
+    )
+
+
+@pytest.mark.parametrize("date_range", [None, (date(2022, 1, 3), date(2022, 1, 9)), (date(2023, 1, 1), date(2023, 2, 1))])
+def test_slice_dates_matches_boolean_mask(canonical_df, date_range):
+    series = select_rows(canonical_df, "Beras", ["Bali"])
+    
+    pd.testing.assert_frame_equal(slice_dates(series, date_range), _reference_rows(series, date_range=date_range))
+    
+    # Out-of-order input takes the mask path
+    reversed_series = series.iloc[::-1]
+    pd.testing.assert_frame_equal(
+        slice_dates(reversed_series, date_range),
+        _reference_rows(reversed_series, date_range=date_range),
+    )
+
+
+def test_hash_frame_is_stable_for_the_fingerprinted_frame(canonical_df):
+    set_fingerprint(canonical_df, "processed_test")
+    
+    assert hash_frame(canonical_df) == hash_frame(canonical_df.copy())
+
+
+def test_hash_frame_hashes_same_shape_copies_without_the_fingerprint_by_content(canonical_df):
+    set_fingerprint(canonical_df, "processed_test")
+    
+    # Derived same-shape copies drop the fingerprint (see set_fingerprint);
+    # edit a row in the middle of the frame
+    edited = canonical_df.copy()
+    edited.attrs.pop(FINGERPRINT_ATTR)
+    edited.loc[len(edited) // 2 + 5, COL_PRICE] = 1.0
+    unchanged = canonical_df.copy()
+    unchanged.attrs.pop(FINGERPRINT_ATTR)
+    
+    assert hash_frame(canonical_df) == "processed_test"
+    assert hash_frame(edited) != hash_frame(unchanged)
+    assert hash_frame(edited) != hash_frame(canonical_df)
+
+
+def test_hash_frame_hashes_other_frames_by_content(canonical_df):
+    subset = select_rows(canonical_df, "Gula", ["Aceh"])
+    
+    assert hash_frame(subset) == hash_frame(subset.copy())
+    assert hash_frame(subset) != hash_frame(select_rows(canonical_df, "Gula", ["Bali"]))
@@ -0,0 +1,36 @@
+"""Tests for the download serializers in src/io.py."""
+
+from io import BytesIO
+
+import numpy as np
+import pandas as pd
+import pytest
+
+from src.io import to_csv_bytes, to_parquet_bytes
+
+
+def _export_frame() -> pd.DataFrame:
+    return pd.DataFrame({
+        "date": pd.to_datetime(["2022-01-01", "2022-01-02 10:00:00", None], format="mixed"),
+        "day": pd.to_datetime(["2022-01-01", "2022-01-02", None]),
+        "commodity": pd.Categorical(["Beras", 'Gula, "Pasir"', "Beras"]),
+        "price": np.array([12500.0, 2.5, np.nan], dtype=np.float32),
+        "count": [1, 2, 3],
+        "note": ["a", None, "c d"],
+        "flag": [True, False, True],
+    })
+
+
+def test_csv_export_matches_pandas_to_csv():
+    df = _export_frame()
+    
+    assert to_csv_bytes(df) == df.to_csv(index=False).encode()
+    assert to_csv_bytes(df, index=True) == df.to_csv(index=True).encode()
+
+
+def test_parquet_export_round_trips():
+    pytest.importorskip("pyarrow")
+    df = _export_frame()
+    
+    pd.testing.assert_frame_equal(pd.read_parquet(BytesIO(to_parquet_bytes(df))), df)
+
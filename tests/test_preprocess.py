@@ -0,0 +1,108 @@
+"""Tests for src/preprocess.py against per-value and plain pandas references."""
+
+from io import StringIO
+
+import numpy as np
+import pandas as pd
+import pytest
+
+from src.constants import COL_COMMODITY, COL_DAILY_CHANGE, COL_MA7, COL_MA14, COL_PRICE, COL_REGION
+from src.preprocess import (
+    add_derived_columns,
+    parse_price_column,
+    parse_price_value,
+    process_single_commodity,
+    rolling_mean,
+    rolling_means,
+)
+
+
+# Wide file with formatted prices: currency prefix, thousands dots,
+# accounting negatives and blanks
+FORMATTED_PRICE_CSV = """Date,Aceh,Bali,Banten
+2022-01-01,"Rp 12.500","(1.000)",Rp 8.000
+2022-01-02,"Rp 12.600","Rp 9.000",
+2022-01-03,"Rp 12.700",,"$1,200"
+2022-01-04,"Rp 12.800","Rp 9.100",Rp 8.100
+"""
+
+
+def _read(csv_text: str, **options) -> pd.DataFrame:
+    return pd.read_csv(StringIO(csv_text), **options)
+
+
+@pytest.mark.parametrize("backend", ["numpy", "pyarrow"])
+def test_formatted_prices_survive_processing(backend):
+    if backend == "pyarrow":
+        pytest.importorskip("pyarrow")
+        raw = _read(FORMATTED_PRICE_CSV, engine="pyarrow", dtype_backend="pyarrow")
+    else:
+        raw = _read(FORMATTED_PRICE_CSV)
+    
+    result = process_single_commodity(raw, "Gula")
+    
+    assert len(result) == 10
+    by_region = result.groupby(COL_REGION)[COL_PRICE].apply(list).to_dict()
+    assert by_region["Aceh"] == [12500.0, 12600.0, 12700.0, 12800.0]
+    assert by_region["Bali"] == [-1000.0, 9000.0, 9100.0]
+    assert by_region["Banten"] == [8000.0, 1200.0, 8100.0]
+
+
+@pytest.mark.parametrize("dtype", [object, "string[python]", "string[pyarrow]", "arrow"])
+def test_parse_price_column_matches_parse_price_value(dtype):
+    if dtype in ("string[pyarrow]", "arrow"):
+        pa = pytest.importorskip("pyarrow")
+        if dtype == "arrow":
+            # What read_csv(dtype_backend="pyarrow") produces
+            dtype = pd.ArrowDtype(pa.string())
+    values = ["Rp 1.000", "(2.500)", None, "abc", "(3)", "€ 4,5", "  7 ", "()"]
+    
+    parsed = parse_price_column(pd.Series(values, dtype=dtype))
+    expected = [parse_price_value(value) for value in values]
+    
+    np.testing.assert_array_equal(parsed.to_numpy(), np.array(expected, dtype=float))
+
+
+def test_parse_price_column_keeps_numeric_cells_of_mixed_columns():
+    values = ["Rp 1.000", 2500, None, 3.5]
+    
+    parsed = parse_price_column(pd.Series(values, dtype=object))
+    
+    np.testing.assert_array_equal(parsed.to_numpy(), [1000.0, 2500.0, np.nan, 3.5])
+
+
+@pytest.mark.parametrize("window", [1, 3, 7, 14, 40])
+def test_rolling_mean_matches_pandas_rolling(window):
+    values = np.random.default_rng(1).uniform(1_000, 90_000, 30)
+    
+    expected = pd.Series(values).rolling(window).mean().to_numpy()
+    
+    np.testing.assert_allclose(rolling_mean(values, window), expected, rtol=1e-12, equal_nan=True)
+
+
+def test_rolling_means_restart_at_each_series():
+    values = np.random.default_rng(2).uniform(1_000, 90_000, 25)
+    series_id = np.repeat([0, 1, 2], [10, 3, 12])
+    starts = np.array([np.flatnonzero(series_id == i)[0] for i in series_id])
+    
+    ma7, ma14 = rolling_means(values, (7, 14), starts)
+    
+    grouped = pd.Series(values).groupby(series_id)
+    np.testing.assert_allclose(ma7, grouped.transform(lambda s: s.rolling(7).mean()), rtol=1e-12, equal_nan=True)
+    np.testing.assert_allclose(ma14, grouped.transform(lambda s: s.rolling(14).mean()), rtol=1e-12, equal_nan=True)
+
+
+def test_add_derived_columns_matches_per_series_pandas(canonical_df):
+    result = add_derived_columns(canonical_df.copy())
+    
+    # Reference: each series in date order with missing prices skipped
+    valid = canonical_df.dropna(subset=[COL_PRICE])
+    prices = valid.groupby([COL_COMMODITY, COL_REGION], observed=True)[COL_PRICE]
+    expected = pd.DataFrame({
+        COL_MA7: prices.transform(lambda s: s.astype(float).rolling(7).mean()),
+        COL_MA14: prices.transform(lambda s: s.astype(float).rolling(14).mean()),
+        COL_DAILY_CHANGE: prices.pct_change(fill_method=None) * 100,
+    }).reindex(canonical_df.index)
+    
+    for col in (COL_MA7, COL_MA14, COL_DAILY_CHANGE):
+        np.testing.assert_allclose(result[col].to_numpy(), expected[col].to_numpy(), rtol=1e-6, equal_nan=True)